@@ -1,5 +1,13 @@
+from typing import TYPE_CHECKING, Any
+
 from backend.database import get_supabase
 
+if TYPE_CHECKING:
+    from supabase import Client
+else:
+    # 라우터 시그니처용 별칭. supabase import는 첫 요청의 get_supabase()까지 지연한다.
+    Client = Any
+
 
 def get_db():
     yield get_supabase()
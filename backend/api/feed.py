@@ -0,0 +1,206 @@
+"""수집 결과 실시간 피드.
+
+프로세스당 하나의 폴러가 price_logs/alerts를 id 커서로 읽어 모든 SSE 구독자에게 나눠준다.
+가격은 행 단위가 아니라 수집 회차(collected_at)당 collection 이벤트 한 건으로 보낸다.
+클라이언트 수와 무관하게 DB 조회는 주기당 PK 범위 조회 2회이며,
+새 회차가 있을 때만 최근 수집 내역/상품 목록/대시보드 요약을 한 번씩 다시 조회해
+이벤트에 실어 보낸다 (클라이언트가 각자 REST로 다시 불러오지 않도록).
+
+배포 모델: 폴러는 오래 사는 프로세스(uvicorn, Railway/Render 등)에서만 의미가 있다.
+Vercel은 /api/* 요청마다 함수 인스턴스를 띄우고 응답 시간도 제한하므로
+api.live_feed(LIVE_FEED)가 기본 off이고, 이때 /stream 라우터는 등록되지 않으며
+프론트(VITE_LIVE_FEED)는 연결하지 않고 폴링으로 동작한다.
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+
+from backend.database import get_supabase
+from backend import models
+
+logger = logging.getLogger(__name__)
+
+# collection 이벤트에 싣는 최근 수집 내역 수 (대시보드 RecentCollectionsTable 기본값)
+RECENT_SNAPSHOT_SIZE = 10
+
+
+@dataclass(frozen=True)
+class FeedCursor:
+    price_id: int = 0
+    alert_id: int = 0
+
+    def encode(self) -> str:
+        return f"{self.price_id}-{self.alert_id}"
+
+    @classmethod
+    def decode(cls, value: str | None) -> "FeedCursor | None":
+        """Last-Event-ID('<price_id>-<alert_id>') 파싱. 형식이 틀리면 None."""
+        if not value:
+            return None
+        try:
+            price_id, alert_id = (int(v) for v in value.split("-", 1))
+        except ValueError:
+            return None
+        return cls(price_id, alert_id)
+
+
+@dataclass(frozen=True)
+class FeedEvent:
+    event: str  # "collection" | "goal_reached" | "summary" | "reset"
+    data: dict
+    cursor: FeedCursor | None = None  # 이 이벤트까지 반영된 커서 (summary/reset은 None)
+
+    def encode(self, payload: str) -> str:
+        lines = [f"event: {self.event}"]
+        if self.cursor is not None:
+            lines.append(f"id: {self.cursor.encode()}")
+        lines.append(f"data: {payload}")
+        return "\n".join(lines) + "\n\n"
+
+
+def build_events(
+    runs: list[dict],
+    alerts: list[dict],
+    cursor: FeedCursor,
+    snapshot: dict | None = None,
+) -> tuple[list[FeedEvent], FeedCursor]:
+    """조회 결과를 이벤트 목록으로 변환하고 전진한 커서를 반환한다.
+    snapshot(recent/products)은 마지막 collection 이벤트에만 싣는다.
+    """
+    events = []
+    for n, row in enumerate(runs):
+        cursor = FeedCursor(max(cursor.price_id, row["last_id"]), cursor.alert_id)
+        data = {
+            "last_id": row["last_id"],
+            "collected_at": row["collected_at"],
+            "price_count": row["price_count"],
+            "product_count": row["product_count"],
+        }
+        if snapshot and n == len(runs) - 1:
+            data.update(snapshot)
+        events.append(FeedEvent("collection", data, cursor))
+    for row in alerts:
+        cursor = FeedCursor(cursor.price_id, row["id"])
+        events.append(FeedEvent("goal_reached", {
+            "id": row["id"],
+            "product_id": row["product_id"],
+            "product_name": row["product_name"],
+            "price": row["triggered_price"],
+            "target_price": row["target_price"],
+            "shop": row["shop_name"],
+            "notified_at": row["notified_at"],
+        }, cursor))
+    return events, cursor
+
+
+def fetch_events(cursor: FeedCursor, limit: int) -> tuple[list[FeedEvent], FeedCursor, bool]:
+    """cursor 이후 이벤트 조회 (동기, 스레드에서 호출).
+    세 번째 값은 잘렸는지 여부 (가격 행이 FEED_RUN_SCAN_LIMIT, 알림이 limit에 걸림).
+    """
+    client = get_supabase()
+    runs = models.get_collection_runs_after(client, cursor.price_id)
+    alerts = models.get_alerts_after(client, cursor.alert_id, limit=limit)
+    snapshot = None
+    if runs:
+        snapshot = {
+            "recent": models.get_recent_collections(client, RECENT_SNAPSHOT_SIZE),
+            "products": models.get_all_products(client),
+        }
+    events, cursor = build_events(runs, alerts, cursor, snapshot)
+    truncated = (
+        sum(r["price_count"] for r in runs) >= models.FEED_RUN_SCAN_LIMIT
+        or len(alerts) >= limit
+    )
+    return events, cursor, truncated
+
+
+def summary_delta(previous: dict | None, current: dict) -> dict:
+    if previous is None:
+        return {}
+    return {
+        key: current[key] - previous[key]
+        for key in current
+        if current[key] != previous.get(key)
+    }
+
+
+class CollectionFeed:
+    """구독자가 있을 때만 돌아가는 공유 폴러."""
+
+    def __init__(self, poll_interval: float = 5.0, batch_limit: int = models.BATCH_SIZE):
+        self.poll_interval = poll_interval
+        self.batch_limit = batch_limit
+        self._subscribers: set[asyncio.Queue] = set()
+        self._task: asyncio.Task | None = None
+        self._cursor: FeedCursor | None = None
+        self._summary: dict | None = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.batch_limit * 4)
+        self._subscribers.add(queue)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _publish(self, event: FeedEvent):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # 느린 클라이언트는 끊고(None) Last-Event-ID로 재접속하게 한다
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    async def _poll_once(self):
+        if self._cursor is None:
+            price_id, alert_id = await asyncio.to_thread(models.get_feed_head, get_supabase())
+            self._cursor = FeedCursor(price_id, alert_id)
+            return
+
+        events, self._cursor, _ = await asyncio.to_thread(fetch_events, self._cursor, self.batch_limit)
+        for event in events:
+            self._publish(event)
+
+        if events or self._summary is None:
+            current = await asyncio.to_thread(models.get_dashboard_summary, get_supabase())
+            if current != self._summary:
+                data = {**current, "changed": summary_delta(self._summary, current)}
+                self._summary = current
+                self._publish(FeedEvent("summary", data))
+
+    async def _run(self):
+        try:
+            while self._subscribers:
+                try:
+                    await self._poll_once()
+                except Exception as e:
+                    logger.warning(f"피드 폴링 실패: {e}")
+                await asyncio.sleep(self.poll_interval)
+        finally:
+            # 구독자가 없던 동안의 행을 다음 구독자에게 재생하지 않도록 커서/요약을 버린다
+            self._task = None
+            self._cursor = None
+            self._summary = None
+
+    @property
+    def cursor(self) -> FeedCursor | None:
+        return self._cursor
+
+    @property
+    def summary(self) -> dict | None:
+        return self._summary
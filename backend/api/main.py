@@ -1,18 +1,35 @@
 import os
+import asyncio
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import JSONResponse
 
 from backend.database import init_db, get_config
-from backend.api.routers import products, prices, dashboard
+from backend.api.routers import products, prices, dashboard, stream
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_up_db():
+    """Supabase 클라이언트 생성 + 연결 확인. 실패해도 첫 요청에서 다시 시도된다."""
+    try:
+        init_db()
+    except Exception as e:
+        logger.warning(f"DB 연결 확인 실패: {e}")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    init_db()
+    # 연결 확인은 백그라운드로 돌려 콜드스타트 시 첫 요청을 막지 않는다.
+    # 서버리스(Vercel)에서는 응답 후 인스턴스가 동결될 수 있어 생략하고 첫 요청에서 지연 생성한다.
+    if not os.environ.get("VERCEL"):
+        asyncio.get_running_loop().run_in_executor(None, _warm_up_db)
     yield
+    await stream.shutdown_feed()
 
 
 # Vercel 배포 시 /api prefix 사용, 로컬에서는 없음
@@ -38,10 +55,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축: 1KB 이상만. brotli-asgi가 있으면 br 우선(미지원 클라이언트는 gzip), 없으면 gzip.
+# SSE(/stream)는 버퍼링되지 않도록 제외한다.
+COMPRESS_MIN_SIZE = 1024
+try:
+    from brotli_asgi import BrotliMiddleware
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=COMPRESS_MIN_SIZE, compresslevel=5)
+else:
+    app.add_middleware(BrotliMiddleware, minimum_size=COMPRESS_MIN_SIZE, excluded_handlers=[r"/stream/"])
+
 # Routers
+# 모든 라우트에 response_model이 있으므로 기본 응답 클래스를 유지해야
+# FastAPI가 스키마 검증 + Pydantic(Rust) JSON 직렬화 fast path를 쓴다.
 app.include_router(products.router)
 app.include_router(prices.router)
 app.include_router(dashboard.router)
+# /stream은 프로세스에 상주하는 공유 폴러가 필요하다. 서버리스(Vercel)에서는 요청마다
+# 인스턴스가 따로 뜨고 응답 시간도 제한되므로 등록하지 않고, 프론트는 폴링으로 동작한다.
+if config.get("api", {}).get("live_feed", True):
+    app.include_router(stream.router)
 
 
 @app.exception_handler(Exception)
@@ -1,8 +1,6 @@
-from supabase import Client
-
 from fastapi import APIRouter, Depends
 
-from backend.api.dependencies import get_db
+from backend.api.dependencies import Client, get_db
 from backend.api.schemas import DashboardSummaryResponse
 from backend import models
 
@@ -1,18 +1,19 @@
-from supabase import Client
-
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from backend.api.dependencies import get_db
+from backend.api.dependencies import Client, get_db
 from backend.api.schemas import (
     PriceHistoryItem,
     LatestPriceResponse,
     PriceStatsResponse,
     RecentCollectionItem,
+    ProductPricesBatchItem,
 )
 from backend import models
 
 router = APIRouter(prefix="/prices", tags=["prices"])
 
+BATCH_MAX_IDS = 500
+
 
 @router.get("/recent", response_model=list[RecentCollectionItem])
 def recent_collections(
@@ -22,16 +23,29 @@ def recent_collections(
     return models.get_recent_collections(db, limit=limit)
 
 
+@router.get("/batch", response_model=list[ProductPricesBatchItem])
+def prices_batch(
+    ids: list[int] = Query(..., min_length=1, max_length=BATCH_MAX_IDS, description="상품 ID 목록 (?ids=1&ids=2)"),
+    days: int = Query(30, ge=0, description="통계 산출 기간 (0=전체)"),
+    db: Client = Depends(get_db),
+):
+    return models.get_prices_batch(db, ids, days=days)
+
+
 @router.get("/{product_id}", response_model=list[PriceHistoryItem])
 def price_history(
     product_id: int,
     days: int = Query(30, ge=0, description="최근 N일 (0=전체)"),
+    points: int | None = Query(
+        None, ge=2, le=models.MAX_HISTORY_POINTS,
+        description=f"최대 포인트 수. 초과 시 구간별 최저/최고가로 축약 (기본 {models.MAX_HISTORY_POINTS})",
+    ),
     db: Client = Depends(get_db),
 ):
     product = models.get_product_by_id(db, product_id)
     if not product:
         raise HTTPException(status_code=404, detail="해당 상품을 찾을 수 없습니다.")
-    return models.get_price_history(db, product_id, days=days)
+    return models.get_price_history(db, product_id, days=days, points=points)
 
 
 @router.get("/{product_id}/latest", response_model=LatestPriceResponse)
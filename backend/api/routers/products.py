@@ -1,18 +1,28 @@
-from supabase import Client
-from postgrest.exceptions import APIError
+import io
+import csv
+import json
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
 
-from backend.api.dependencies import get_db
-from backend.api.schemas import ProductCreate, ProductUpdate, ProductResponse
+from backend.api.dependencies import Client, get_db
+from backend.api.schemas import (
+    ProductCreate,
+    ProductUpdate,
+    ProductResponse,
+    ProductBulkResponse,
+)
 from backend import models
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+BULK_MAX_ROWS = 5000
+
 
 @router.get("", response_model=list[ProductResponse])
 def list_products(
-    search: str | None = Query(None, description="키워드 검색 필터"),
+    search: str | None = Query(None, description="키워드 검색 (접두어/부분/자모 유사 일치, 관련도순)"),
     product_status: str | None = Query(None, alias="status", description="상태 필터: goal_reached, monitoring, no_target"),
     db: Client = Depends(get_db),
 ):
@@ -24,6 +34,9 @@ def create_product(
     body: ProductCreate,
     db: Client = Depends(get_db),
 ):
+    # get_db()에서 supabase가 이미 로드된 뒤이므로 여기서 import해도 비용이 없다.
+    from postgrest.exceptions import APIError
+
     try:
         product = models.create_product(db, keyword=body.keyword, target_price=body.target_price, memo=body.memo)
     except APIError as e:
@@ -36,6 +49,78 @@ def create_product(
     return product
 
 
+def _parse_bulk_body(body: bytes, content_type: str) -> list[dict]:
+    """CSV(헤더: keyword,target_price,memo) 또는 JSON 배열/{"products": [...]}을 행 목록으로."""
+    try:
+        if "csv" in content_type:
+            reader = csv.DictReader(io.StringIO(body.decode("utf-8-sig")))
+            return [
+                {k.strip(): (v.strip() or None) if isinstance(v, str) else v for k, v in row.items() if k}
+                for row in reader
+            ]
+        data = json.loads(body)
+    except (UnicodeDecodeError, ValueError, csv.Error):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="요청 본문을 해석할 수 없습니다.")
+    if isinstance(data, dict):
+        data = data.get("products")
+    if not isinstance(data, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='상품 배열 또는 {"products": [...]} 형식이어야 합니다.',
+        )
+    return data
+
+
+@router.post("/bulk", response_model=ProductBulkResponse)
+async def bulk_upsert_products(
+    request: Request,
+    db: Client = Depends(get_db),
+):
+    """JSON/CSV 상품 목록을 키워드 기준으로 일괄 등록·수정. 행별 결과를 반환한다."""
+    raw_rows = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    if len(raw_rows) > BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"한 번에 최대 {BULK_MAX_ROWS}건까지 처리할 수 있습니다.",
+        )
+
+    # 행 단위 검증: 잘못된 행만 실패 처리하고 나머지는 진행
+    results: list[dict] = []
+    valid: list[dict] = []
+    seen: set[str] = set()
+    for n, raw in enumerate(raw_rows, start=1):
+        keyword = raw.get("keyword") if isinstance(raw, dict) else None
+        try:
+            item = ProductCreate.model_validate(raw)
+        except ValidationError as e:
+            err = e.errors()[0]
+            field = ".".join(str(x) for x in err["loc"])
+            detail = f"{field}: {err['msg']}" if field else err["msg"]
+            # 결과의 keyword는 문자열만 그대로 돌려준다 (숫자/목록 등은 응답 검증에서 500이 된다)
+            keyword = keyword if isinstance(keyword, str) else None
+            results.append({"row": n, "keyword": keyword, "status": "error", "detail": detail})
+            continue
+        if item.keyword in seen:
+            results.append({"row": n, "keyword": item.keyword, "status": "error", "detail": "요청 안에 중복된 키워드입니다."})
+            continue
+        seen.add(item.keyword)
+        valid.append({"row": n, **item.model_dump()})
+
+    if valid:
+        results.extend(await run_in_threadpool(models.upsert_products_bulk, db, valid))
+    results.sort(key=lambda r: r["row"])
+
+    counts = {"created": 0, "updated": 0, "error": 0}
+    for r in results:
+        counts[r["status"]] += 1
+    return {
+        "created": counts["created"],
+        "updated": counts["updated"],
+        "failed": counts["error"],
+        "results": results,
+    }
+
+
 @router.put("/{product_id}", response_model=ProductResponse)
 def update_product(
     product_id: int,
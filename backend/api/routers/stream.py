@@ -0,0 +1,104 @@
+import asyncio
+
+from fastapi import APIRouter, Header, Query, Request
+from fastapi.responses import StreamingResponse
+
+from backend.api.feed import CollectionFeed, FeedCursor, FeedEvent, fetch_events
+from backend.api.schemas import FeedCollectionEvent, FeedGoalReachedEvent, FeedSummaryEvent
+from backend.database import get_config
+
+router = APIRouter(prefix="/stream", tags=["stream"])
+
+KEEPALIVE_SECONDS = 15
+
+_EVENT_SCHEMAS = {
+    "collection": FeedCollectionEvent,
+    "goal_reached": FeedGoalReachedEvent,
+    "summary": FeedSummaryEvent,
+}
+
+_feed: CollectionFeed | None = None
+
+
+def get_feed() -> CollectionFeed:
+    global _feed
+    if _feed is None:
+        api_config = get_config().get("api", {})
+        _feed = CollectionFeed(poll_interval=float(api_config.get("feed_poll_seconds", 5)))
+    return _feed
+
+
+async def shutdown_feed():
+    if _feed is not None:
+        await _feed.stop()
+
+
+def _encode(event: FeedEvent) -> str:
+    schema = _EVENT_SCHEMAS.get(event.event)
+    payload = schema(**event.data).model_dump_json() if schema else "{}"
+    return event.encode(payload)
+
+
+def _already_sent(event: FeedEvent, sent: FeedCursor) -> bool:
+    if event.event == "collection":
+        return event.data["last_id"] <= sent.price_id
+    if event.event == "goal_reached":
+        return event.data["id"] <= sent.alert_id
+    return False
+
+
+async def _event_stream(request: Request, feed: CollectionFeed, resume: FeedCursor | None):
+    # 먼저 구독해 두고 재개 구간을 보충한 뒤, 중복은 id로 걸러낸다
+    queue = feed.subscribe()
+    sent = resume or FeedCursor()
+    try:
+        yield "retry: 5000\n\n"
+
+        if resume is not None:
+            events, _, truncated = await asyncio.to_thread(fetch_events, resume, feed.batch_limit)
+            if truncated:
+                # 놓친 구간이 너무 길면 클라이언트가 REST로 다시 불러오게 한다
+                yield _encode(FeedEvent("reset", {}))
+            else:
+                for event in events:
+                    yield _encode(event)
+                    sent = event.cursor
+
+        if feed.summary is not None:
+            yield _encode(FeedEvent("summary", {**feed.summary, "changed": {}}))
+
+        while True:
+            if await request.is_disconnected():
+                break
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                break
+            if _already_sent(event, sent):
+                continue
+            yield _encode(event)
+            if event.cursor is not None:
+                sent = FeedCursor(
+                    max(sent.price_id, event.cursor.price_id),
+                    max(sent.alert_id, event.cursor.alert_id),
+                )
+    finally:
+        feed.unsubscribe(queue)
+
+
+@router.get("/collections")
+async def collections_stream(
+    request: Request,
+    last_id: str | None = Query(None, description="재개 커서 '<price_id>-<alert_id>' (Last-Event-ID 헤더 대체)"),
+    last_event_id: str | None = Header(None),
+):
+    """수집 회차 적재(collection), 목표가 도달(goal_reached), 요약 변화(summary)를 SSE로 전달한다."""
+    resume = FeedCursor.decode(last_event_id or last_id)
+    return StreamingResponse(
+        _event_stream(request, get_feed(), resume),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
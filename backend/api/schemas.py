@@ -77,6 +77,31 @@ class PriceStatsResponse(BaseModel):
     data_count: int
 
 
+class ProductBulkResult(BaseModel):
+    row: int
+    keyword: str | None = None
+    status: str  # created, updated, error
+    id: int | None = None
+    detail: str | None = None
+
+
+class ProductBulkResponse(BaseModel):
+    created: int
+    updated: int
+    failed: int
+    results: list[ProductBulkResult]
+
+
+class ProductPricesBatchItem(BaseModel):
+    product_id: int
+    keyword: str
+    min_price: int | None = None
+    shop: str | None = None
+    url: str | None = None
+    collected_at: str | None = None
+    stats: PriceStatsResponse | None = None
+
+
 class DashboardSummaryResponse(BaseModel):
     total_products: int
     goal_reached_count: int
@@ -93,6 +118,30 @@ class RecentCollectionItem(BaseModel):
     collected_at: str
 
 
+class FeedCollectionEvent(BaseModel):
+    last_id: int
+    collected_at: str
+    price_count: int
+    product_count: int
+    # 폴링 주기 마지막 회차에만 실린다. 클라이언트는 다시 조회하지 않고 캐시를 교체한다.
+    recent: list[RecentCollectionItem] | None = None
+    products: list[ProductResponse] | None = None
+
+
+class FeedGoalReachedEvent(BaseModel):
+    id: int
+    product_id: int
+    product_name: str
+    price: int
+    target_price: int
+    shop: str
+    notified_at: str
+
+
+class FeedSummaryEvent(DashboardSummaryResponse):
+    changed: dict[str, int | float] = {}
+
+
 class ErrorResponse(BaseModel):
     detail: str
     error_code: str
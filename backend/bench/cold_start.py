@@ -0,0 +1,137 @@
+"""콜드스타트 벤치마크: 앱 import 시간과 첫 요청 지연을 새 인터프리터에서 측정한다.
+
+첫 요청은 DB를 쓰는 GET /products (PostgREST 응답만 스텁)라서 지연 로드한
+supabase import + create_client 비용이 포함된다.
+
+    python -m backend.bench.cold_start --runs 5 --import-budget-ms 800 --first-request-overhead-ms 150
+
+첫 요청 지연의 대부분은 supabase import + create_client라서 머신마다 편차가 크다.
+같은 머신에서 새 인터프리터로 그 비용만 따로 재서(baseline) 첫 요청이 baseline보다
+--first-request-overhead-ms 이상 느리면 실패로 본다. 절대 상한(--first-request-budget-ms)은 여유 있게 둔다.
+
+예산을 넘기거나, import 시점에 supabase/yaml이 로드되면 종료 코드 1을 반환한다.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+
+# 자식 프로세스에서 실행할 측정 코드
+_PROBE = r"""
+import json, sys, time
+
+t0 = time.perf_counter()
+from backend.api.main import app
+t1 = time.perf_counter()
+eager = [m for m in ("supabase", "postgrest", "yaml") if m in sys.modules]
+
+import httpx
+from fastapi.testclient import TestClient
+
+# PostgREST 호출은 네트워크 대신 빈 결과를 돌려준다 (TestClient는 자체 transport라 영향 없음).
+# supabase import + create_client 비용은 그대로 첫 요청에 포함된다.
+httpx.HTTPTransport.handle_request = lambda self, request: httpx.Response(
+    200, json=[], headers={"content-type": "application/json"}, request=request,
+)
+
+from backend import database
+
+_get_supabase = database.get_supabase
+client_ms = []
+
+def _timed_get_supabase():
+    t = time.perf_counter()
+    try:
+        return _get_supabase()
+    finally:
+        client_ms.append((time.perf_counter() - t) * 1000)
+
+database.get_supabase = _timed_get_supabase
+import backend.api.dependencies as deps
+deps.get_supabase = _timed_get_supabase
+
+with TestClient(app) as c:
+    t2 = time.perf_counter()
+    resp = c.get("/products")
+    t3 = time.perf_counter()
+
+print(json.dumps({
+    "import_ms": (t1 - t0) * 1000,
+    "first_request_ms": (t3 - t2) * 1000,
+    "get_supabase_ms": client_ms[0] if client_ms else 0.0,
+    "status": resp.status_code,
+    "eager_modules": eager,
+}))
+"""
+
+
+# 비교 기준: 앱 없이 supabase import + create_client만
+_BASELINE = r"""
+import json, os, time
+
+t0 = time.perf_counter()
+from supabase import create_client
+create_client(os.environ["SUPABASE_URL"], os.environ["SUPABASE_ANON_KEY"])
+t1 = time.perf_counter()
+print(json.dumps({"client_ms": (t1 - t0) * 1000}))
+"""
+
+
+def _run_once(code: str = _PROBE) -> dict:
+    env = dict(os.environ)
+    # 배포 환경과 동일하게 환경변수 설정을 사용 (config.yaml/네트워크 불필요)
+    env.setdefault("VERCEL", "1")
+    env.setdefault("SUPABASE_URL", "https://example.supabase.co")
+    env.setdefault("SUPABASE_ANON_KEY", "bench")
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="API 콜드스타트 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=800.0)
+    parser.add_argument("--first-request-budget-ms", type=float, default=1000.0, help="절대 상한")
+    parser.add_argument(
+        "--first-request-overhead-ms", type=float, default=150.0,
+        help="baseline(supabase import + create_client) 대비 허용 추가 지연",
+    )
+    args = parser.parse_args()
+
+    results = [_run_once() for _ in range(args.runs)]
+    baseline_ms = statistics.median(_run_once(_BASELINE)["client_ms"] for _ in range(args.runs))
+    import_ms = statistics.median(r["import_ms"] for r in results)
+    first_ms = statistics.median(r["first_request_ms"] for r in results)
+    client_ms = statistics.median(r["get_supabase_ms"] for r in results)
+    eager = sorted({m for r in results for m in r["eager_modules"]})
+
+    print(f"runs={args.runs}")
+    print(f"import (median):        {import_ms:8.1f} ms  (budget {args.import_budget_ms:.0f} ms)")
+    print(f"first request (median): {first_ms:8.1f} ms  (budget {args.first_request_budget_ms:.0f} ms)")
+    print(f"  get_supabase():       {client_ms:8.1f} ms")
+    print(f"baseline (median):      {baseline_ms:8.1f} ms  (supabase import + create_client)")
+    print(f"overhead vs baseline:   {first_ms - baseline_ms:8.1f} ms  (budget {args.first_request_overhead_ms:.0f} ms)")
+    print(f"eager heavy modules:    {', '.join(eager) or '-'}")
+
+    ok = (
+        import_ms <= args.import_budget_ms
+        and first_ms <= args.first_request_budget_ms
+        and first_ms - baseline_ms <= args.first_request_overhead_ms
+        and not eager
+        and all(r["status"] == 200 for r in results)
+    )
+    print("PASS" if ok else "FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""대용량 응답 벤치마크: 직렬화 경로와 압축에 따른 지연(p50/p99)과 전송 바이트 비교.
+
+    python -m backend.bench.responses --products 500 --days 730 --requests 200
+
+DB 대신 합성 데이터를 돌려주도록 models를 바꿔 끼우고, 같은 라우터로 두 앱을 만든다.
+  baseline : default_response_class=JSONResponse (dict → jsonable_encoder → json.dumps), 압축 없음
+  current  : backend.api.main.app (Pydantic JSON fast path + br/gzip)
+"""
+
+import argparse
+import os
+import statistics
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_ANON_KEY", "bench")
+os.environ.setdefault("VERCEL", "1")  # 시작 시 DB 연결 확인 생략
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import models  # noqa: E402
+from backend.api.dependencies import get_db  # noqa: E402
+from backend.api.main import app as current_app  # noqa: E402
+from backend.api.routers import products, prices  # noqa: E402
+
+
+def _fake_products(n: int) -> list[dict]:
+    return [
+        {
+            "id": i, "keyword": f"코카콜라 355ml {i}캔", "target_price": 15000, "memo": "편의점보다 싸게 사기",
+            "is_active": True, "created_at": "2025-01-01T00:00:00+00:00", "updated_at": "2025-01-01T00:00:00+00:00",
+            "latest_price": 14000 + i, "latest_shop": "쿠팡",
+            "latest_url": f"https://search.shopping.naver.com/catalog/{10**10 + i}",
+            "latest_collected_at": "2025-06-01T09:00:00+00:00", "status": "goal_reached",
+            "price_change": -120, "price_change_rate": -0.8,
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def _fake_history(days: int) -> list[dict]:
+    start = date(2024, 1, 1)
+    return [
+        {
+            "date": (start + timedelta(days=d)).isoformat(), "min_price": 14000 + d % 50, "max_price": 19000 + d % 70,
+            "shop": "G마켓", "url": f"https://search.shopping.naver.com/catalog/{10**10 + d}", "collected_count": 40,
+        }
+        for d in range(days)
+    ]
+
+
+def _baseline_app() -> FastAPI:
+    app = FastAPI(default_response_class=JSONResponse)
+    app.include_router(products.router)
+    app.include_router(prices.router)
+    return app
+
+
+def _measure(client: TestClient, path: str, n: int, encoding: str) -> tuple[float, float, int]:
+    headers = {"Accept-Encoding": encoding}
+    client.get(path, headers=headers)  # warm-up
+    timings = []
+    size = 0
+    for _ in range(n):
+        t0 = time.perf_counter()
+        with client.stream("GET", path, headers=headers) as resp:
+            raw = b"".join(resp.iter_raw())
+        timings.append((time.perf_counter() - t0) * 1000)
+        size = len(raw)
+    timings.sort()
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    return statistics.median(timings), p99, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대용량 응답 벤치마크")
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    product_rows = _fake_products(args.products)
+    history_rows = _fake_history(args.days)
+    models.get_all_products = lambda client, search=None, status=None: [dict(r) for r in product_rows]
+    models.get_product_by_id = lambda client, product_id: {"id": product_id}
+    models.get_price_history = lambda client, product_id, days=30, points=None: history_rows
+
+    endpoints = ["/products", "/prices/1?days=0"]
+    cases = [
+        ("baseline", _baseline_app(), "identity"),
+        ("current", current_app, "identity"),
+        ("current", current_app, "gzip"),
+        ("current", current_app, "br, gzip"),
+    ]
+
+    print(f"{'endpoint':<18} {'app':<9} {'encoding':<9} {'p50 ms':>8} {'p99 ms':>8} {'bytes':>9}")
+    for path in endpoints:
+        for name, app, encoding in cases:
+            app.dependency_overrides[get_db] = lambda: None
+            with TestClient(app) as client:
+                p50, p99, size = _measure(client, path, args.requests, encoding)
+            print(f"{path:<18} {name:<9} {encoding:<9} {p50:8.2f} {p99:8.2f} {size:9,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""수집 버퍼 메모리 벤치마크: 행 dict 리스트(기존) vs PriceRowBuffer.
+
+    python -m backend.bench.row_buffer --products 500 --items 100
+
+네이버 응답과 같은 모양의 합성 데이터로 tracemalloc 기준 행당 바이트를 비교한다.
+"""
+
+import argparse
+import json
+import random
+import tracemalloc
+
+from backend.collector.buffer import PriceRowBuffer
+
+SHOPS = ["쿠팡", "G마켓", "11번가", "옥션", "SSG닷컴", "롯데ON", "위메프", "티몬", "네이버", "인터파크"]
+
+
+def _make_items(n: int, seed: int) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {
+            "title": f"<b>코카콜라</b> 355ml 24캔 상품 {seed}-{i}",
+            "link": f"https://search.shopping.naver.com/catalog/{rng.randrange(10**10, 10**11)}",
+            "image": f"https://shopping-phinf.pstatic.net/main_{rng.randrange(10**8)}/{rng.randrange(10**8)}.jpg",
+            "lprice": str(rng.randrange(10000, 30000)),
+            "hprice": "",
+            "mallName": rng.choice(SHOPS),
+            "productId": str(rng.randrange(10**10, 10**11)),
+            "productType": "2",
+            "brand": "코카콜라",
+            "maker": "코카콜라음료",
+            "category1": "식품",
+            "category2": "음료",
+            "category3": "탄산음료",
+            "category4": "콜라",
+        }
+        for i in range(n)
+    ]
+
+
+def _dict_rows(results: list[tuple[int, list[dict]]]) -> list[dict]:
+    rows = []
+    for product_id, items in results:
+        for raw in items:
+            rows.append({
+                "product_id": product_id,
+                "shop_name": raw["mallName"],
+                "price": int(raw["lprice"]),
+                "product_url": raw["link"],
+                "raw_data": json.dumps(raw, ensure_ascii=False),
+            })
+    return rows
+
+
+def _column_rows(results: list[tuple[int, list[dict]]]) -> PriceRowBuffer:
+    buffer = PriceRowBuffer()
+    for product_id, items in results:
+        for raw in items:
+            buffer.append(product_id, raw["mallName"], int(raw["lprice"]), raw["link"], raw)
+    return buffer
+
+
+def _measure(build, results) -> int:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    built = build(results)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    return after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description="수집 버퍼 메모리 벤치마크")
+    parser.add_argument("--products", type=int, default=500)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--shared", type=float, default=0.0,
+                        help="검색 결과를 공유하는 상품 비율 (0~1, 쿼리 병합 효과)")
+    args = parser.parse_args()
+
+    pool: dict[int, list[dict]] = {}
+    results = []
+    for product_id in range(1, args.products + 1):
+        key = 0 if random.Random(product_id).random() < args.shared else product_id
+        if key not in pool:
+            pool[key] = _make_items(args.items, key)
+        results.append((product_id, pool[key]))
+    n_rows = args.products * args.items
+
+    dict_bytes = _measure(_dict_rows, results)
+    col_bytes = _measure(_column_rows, results)
+
+    print(f"rows={n_rows:,}")
+    print(f"list[dict]     : {dict_bytes / n_rows:8.1f} bytes/row  ({dict_bytes / 2**20:.1f} MiB)")
+    print(f"PriceRowBuffer : {col_bytes / n_rows:8.1f} bytes/row  ({col_bytes / 2**20:.1f} MiB)")
+    print(f"reduction      : {(1 - col_bytes / dict_bytes) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
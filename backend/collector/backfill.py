@@ -0,0 +1,193 @@
+"""저장된 raw_data 재필터링 (exclude_keywords/수량 매칭 규칙 변경 후 실행).
+
+    python -m backend.collector.backfill                 # 탈락 건수만 집계 (dry-run)
+    python -m backend.collector.backfill --apply         # 탈락 행을 price_logs_rejected로 이동 + 파생 데이터 재계산
+    python -m backend.collector.backfill --product-id 3  # 한 상품만
+    python -m backend.collector.backfill --refresh-product-ids 3,7  # 파생 데이터 재계산만
+
+price_logs를 id 키셋 페이지로 읽고(메모리는 페이지 × 동시 처리 수로 제한),
+필터 판정은 프로세스 풀에서 병렬로 돌린다. 판정 기준은 현재 상품 키워드 + 현재 설정의 exclude_keywords.
+--apply는 페이지마다 탈락 행을 옮긴 직후 그 페이지 상품의 파생 데이터를 다시 계산한다
+(중간에 죽어도 이미 옮긴 행의 파생 데이터가 어긋난 채로 남지 않도록).
+
+예전 수집기는 다른 리스팅의 원본 응답을 raw_data로 저장한 경우가 있어서,
+raw_data의 lprice/mallName/link가 행의 가격/쇼핑몰/링크와 같은 행만 재평가한다.
+짝이 안 맞는 행은 "짝 불일치"로 세고 건드리지 않는다.
+"""
+
+import os
+import json
+import time
+import logging
+import argparse
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from backend.database import get_supabase, get_config
+from backend import models
+from backend.collector.filter import match_item, to_listing
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+for _noisy in ("httpx", "httpcore", "h2", "hpack", "hpack.hpack", "hpack.table"):
+    logging.getLogger(_noisy).setLevel(logging.WARNING)
+
+REJECT_REASON = "refilter"
+
+_exclude_keywords: list[str] | None = None
+
+
+def _init_worker(exclude_keywords: list[str] | None):
+    global _exclude_keywords
+    _exclude_keywords = exclude_keywords
+
+
+def _is_paired(raw: dict, price: int, shop_name: str, product_url: str | None) -> bool:
+    """raw_data가 이 행의 리스팅에서 나온 것인지 (수집 시 to_listing 결과와 비교)."""
+    try:
+        listing = to_listing(raw)
+    except (TypeError, ValueError):
+        return False
+    return (
+        listing["price"] == price
+        and listing["shop_name"] == shop_name
+        and listing["product_url"] == (product_url or "")
+    )
+
+
+def _refilter_page(rows: list[tuple]) -> tuple[list[tuple[int, int]], int, int]:
+    """(id, product_id, keyword, price, shop_name, product_url, raw_data) 목록
+    → ([(탈락 id, product_id)], raw_data 없어 건너뛴 수, 짝 불일치로 건너뛴 수).
+    """
+    rejected = []
+    skipped = 0
+    mispaired = 0
+    for log_id, product_id, keyword, price, shop_name, product_url, raw in rows:
+        # 예전 행은 json.dumps 결과가 문자열 그대로 저장돼 있다
+        if isinstance(raw, str):
+            try:
+                raw = json.loads(raw)
+            except ValueError:
+                raw = None
+        if not isinstance(raw, dict):
+            skipped += 1
+            continue
+        if not _is_paired(raw, price, shop_name, product_url):
+            mispaired += 1
+            continue
+        if not match_item(keyword, raw, _exclude_keywords):
+            rejected.append((log_id, product_id))
+    return rejected, skipped, mispaired
+
+
+def refresh(client, product_ids: list[int]):
+    """상품 단위로 나눠 파생 데이터 재계산 (한 RPC가 전체 이력을 다시 계산하지 않도록)."""
+    for i in range(0, len(product_ids), models.REFRESH_BATCH_SIZE):
+        models.refresh_price_derivations(client, product_ids[i : i + models.REFRESH_BATCH_SIZE])
+
+
+def run(
+    apply: bool = False,
+    page_size: int = 1000,
+    workers: int | None = None,
+    start_id: int = 0,
+    product_id: int | None = None,
+):
+    start_time = time.time()
+    client = get_supabase()
+    exclude_keywords = get_config().get("collector", {}).get("exclude_keywords", [])
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 2
+
+    scanned = rejected = moved = skipped = mispaired = 0
+    last_id = start_id
+    refreshed = 0
+    pending: deque = deque()
+
+    def drain_one():
+        nonlocal scanned, rejected, moved, skipped, mispaired, refreshed
+        page_last_id, page_rows, future = pending.popleft()
+        page_rejected, page_skipped, page_mispaired = future.result()
+        scanned += page_rows
+        rejected += len(page_rejected)
+        skipped += page_skipped
+        mispaired += page_mispaired
+        if apply and page_rejected:
+            moved += models.reject_price_logs(client, [i for i, _ in page_rejected], REJECT_REASON)
+            product_ids = sorted({p for _, p in page_rejected})
+            try:
+                refresh(client, product_ids)
+            except Exception:
+                ids = ",".join(map(str, product_ids))
+                logger.error(
+                    f"~id {page_last_id}: 행 이동 후 파생 데이터 재계산 실패 (상품 {ids}). "
+                    f"--refresh-product-ids {ids}로 재계산한 뒤 --start-id {page_last_id} --apply로 재개"
+                )
+                raise
+            refreshed += len(product_ids)
+        elapsed = time.time() - start_time
+        logger.info(
+            f"~id {page_last_id}: 검사 {scanned} / 탈락 {rejected} / 건너뜀 {skipped} "
+            f"/ 짝 불일치 {mispaired} ({scanned / elapsed:.0f}행/s)"
+        )
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(exclude_keywords,)) as pool:
+        while True:
+            page = models.get_price_logs_page(client, last_id, page_size, product_id)
+            if not page:
+                break
+            rows = [
+                (r["id"], r["product_id"], r["keyword"], r["price"], r["shop_name"], r["product_url"], r["raw_data"])
+                for r in page
+            ]
+            last_id = rows[-1][0]
+            pending.append((last_id, len(rows), pool.submit(_refilter_page, rows)))
+            if len(pending) >= max_in_flight:
+                drain_one()
+            if len(page) < page_size:
+                break
+        while pending:
+            drain_one()
+
+    elapsed = time.time() - start_time
+    if apply:
+        logger.info(
+            f"완료: 검사 {scanned} / 이동 {moved} / 건너뜀 {skipped} / 짝 불일치 {mispaired} "
+            f"/ 파생 재계산 상품 {refreshed}건 "
+            f"({elapsed:.1f}초, 마지막 id {last_id})"
+        )
+    else:
+        logger.info(
+            f"dry-run: 검사 {scanned} / 탈락 예정 {rejected} / 건너뜀 {skipped} / 짝 불일치 {mispaired} "
+            f"({elapsed:.1f}초, 마지막 id {last_id}) — --apply로 반영"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저장된 raw_data 재필터링")
+    parser.add_argument("--apply", action="store_true", help="탈락 행 이동 + 파생 데이터 재계산 (기본: 집계만)")
+    parser.add_argument("--page-size", type=int, default=1000, help="페이지당 행 수")
+    parser.add_argument("--workers", type=int, default=None, help="필터 프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--start-id", type=int, default=0, help="이 id 이후부터 (중단 후 재개용)")
+    parser.add_argument("--product-id", type=int, default=None, help="한 상품만")
+    parser.add_argument(
+        "--refresh-product-ids", default=None,
+        help="재필터링 없이 이 상품들(쉼표 구분)의 파생 데이터만 재계산 (중단 후 복구용)",
+    )
+    args = parser.parse_args()
+    if args.refresh_product_ids:
+        product_ids = sorted({int(v) for v in args.refresh_product_ids.split(",") if v.strip()})
+        refresh(get_supabase(), product_ids)
+        logger.info(f"파생 데이터 재계산 완료: 상품 {len(product_ids)}개")
+        raise SystemExit(0)
+    run(
+        apply=args.apply,
+        page_size=args.page_size,
+        workers=args.workers,
+        start_id=args.start_id,
+        product_id=args.product_id,
+    )
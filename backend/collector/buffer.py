@@ -0,0 +1,59 @@
+import json
+from array import array
+
+
+class PriceRowBuffer:
+    """price_logs 적재 대기 행을 컬럼 단위로 모아두는 버퍼.
+
+    행마다 dict를 만들지 않고 숫자는 array, 쇼핑몰명과 raw JSON은 중복 없이 한 번만 보관한다.
+    columns()가 RPC(fn_insert_price_logs) 인자 형태 그대로의 컬럼 리스트를 만든다.
+    """
+
+    __slots__ = (
+        "product_ids", "prices", "shop_ids", "raw_ids", "urls",
+        "shops", "raws", "_shop_index", "_raw_index",
+    )
+
+    def __init__(self):
+        self.product_ids = array("q")
+        self.prices = array("q")
+        self.shop_ids = array("l")
+        self.raw_ids = array("l")  # -1 = raw 없음
+        self.urls: list[str | None] = []
+        self.shops: list[str] = []
+        self.raws: list[str] = []
+        self._shop_index: dict[str, int] = {}
+        self._raw_index: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+    def _intern(self, value: str, values: list[str], index: dict[str, int]) -> int:
+        idx = index.get(value)
+        if idx is None:
+            idx = index[value] = len(values)
+            values.append(value)
+        return idx
+
+    def append(self, product_id: int, shop_name: str, price: int, product_url: str | None, raw: dict | None):
+        self.product_ids.append(product_id)
+        self.prices.append(price)
+        self.shop_ids.append(self._intern(shop_name, self.shops, self._shop_index))
+        self.urls.append(product_url)
+        if raw:
+            raw_json = json.dumps(raw, ensure_ascii=False)
+            self.raw_ids.append(self._intern(raw_json, self.raws, self._raw_index))
+        else:
+            self.raw_ids.append(-1)
+
+    def columns(self, start: int = 0, stop: int | None = None) -> dict[str, list]:
+        """[start, stop) 구간을 컬럼별 리스트로 반환."""
+        stop = len(self) if stop is None else stop
+        shops, raws = self.shops, self.raws
+        return {
+            "product_id": self.product_ids[start:stop].tolist(),
+            "shop_name": [shops[i] for i in self.shop_ids[start:stop]],
+            "price": self.prices[start:stop].tolist(),
+            "product_url": self.urls[start:stop],
+            "raw_data": [raws[i] if i >= 0 else None for i in self.raw_ids[start:stop]],
+        }
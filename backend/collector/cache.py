@@ -0,0 +1,45 @@
+import os
+import json
+import time
+import hashlib
+import logging
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """네이버 검색 원본 응답의 디스크 TTL 캐시.
+    짧은 간격으로 수집을 다시 돌릴 때 API 호출을 건너뛰기 위한 용도.
+    """
+
+    def __init__(self, cache_dir: str | Path, ttl_seconds: int):
+        self.cache_dir = Path(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, query: str, display: int) -> Path:
+        digest = hashlib.sha1(f"{query}\0{display}".encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def get(self, query: str, display: int) -> list[dict] | None:
+        path = self._path(query, display)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("fetched_at", 0) > self.ttl_seconds:
+            return None
+        return entry.get("items")
+
+    def set(self, query: str, display: int, items: list[dict]):
+        path = self._path(query, display)
+        tmp = path.with_suffix(".tmp")
+        entry = {"query": query, "display": display, "fetched_at": time.time(), "items": items}
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"[{query}] 검색 캐시 저장 실패: {e}")
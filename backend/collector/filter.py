@@ -30,48 +30,52 @@ def _match_qty_in_title(number: str, title: str) -> bool:
     return False
 
 
-def filter_products(
+def normalize_query(keyword: str) -> str:
+    """검색 결과를 공유할 수 있는 키워드끼리 같은 키를 돌려준다.
+    대소문자/공백 차이와 수량 단위 표기('30개' vs '30캔')를 무시한다.
+    """
+    tokens = []
+    for token in keyword.lower().split():
+        is_qty, number = _is_qty_token(token)
+        tokens.append(f"{number}#qty" if is_qty else token)
+    return " ".join(tokens)
+
+
+def match_item(
     keyword: str,
-    items: list[dict],
+    item: dict,
     exclude_keywords: list[str] | None = None,
-) -> list[dict]:
+) -> bool:
+    """네이버 검색 결과 1건이 키워드 조건을 만족하는지."""
     tokens = keyword.lower().split()
     keyword_lower = keyword.lower()
     exclude = exclude_keywords or ["세트", "묶음", "박스", "개입"]
 
-    result = []
-    for item in items:
-        title = clean_html(item.get("title", "")).lower()
-
-        # 토큰 매칭: 수량 토큰은 유연하게, 나머지는 정확히
-        matched = True
-        for token in tokens:
-            is_qty, number = _is_qty_token(token)
-            if is_qty:
-                if not _match_qty_in_title(number, title):
-                    matched = False
-                    break
-            else:
-                if token not in title:
-                    matched = False
-                    break
-        if not matched:
-            continue
-
-        # 제외 키워드 체크 (원래 키워드에 포함된 경우 제외하지 않음)
-        excluded = False
-        for ex in exclude:
-            if ex.lower() in title and ex.lower() not in keyword_lower:
-                excluded = True
-                break
-        if excluded:
-            continue
-
-        result.append({
-            "title": clean_html(item.get("title", "")),
-            "price": int(item.get("lprice", 0)),
-            "shop_name": item.get("mallName", ""),
-            "product_url": item.get("link", ""),
-        })
-
-    return result
+    title = clean_html(item.get("title", "")).lower()
+
+    # 토큰 매칭: 수량 토큰은 유연하게, 나머지는 정확히
+    for token in tokens:
+        is_qty, number = _is_qty_token(token)
+        if is_qty:
+            if not _match_qty_in_title(number, title):
+                return False
+        else:
+            if token not in title:
+                return False
+
+    # 제외 키워드 체크 (원래 키워드에 포함된 경우 제외하지 않음)
+    for ex in exclude:
+        if ex.lower() in title and ex.lower() not in keyword_lower:
+            return False
+
+    return True
+
+
+def to_listing(item: dict) -> dict:
+    return {
+        "title": clean_html(item.get("title", "")),
+        "price": int(item.get("lprice", 0)),
+        "shop_name": item.get("mallName", ""),
+        "product_url": item.get("link", ""),
+    }
+
@@ -1,11 +1,12 @@
 import time
-import json
 import logging
 
 from backend.database import get_supabase, get_config
 from backend import models
 from backend.collector.naver_api import search_products
-from backend.collector.filter import filter_products
+from backend.collector.filter import match_item, to_listing, normalize_query
+from backend.collector.cache import SearchCache
+from backend.collector.buffer import PriceRowBuffer
 from backend.collector.notifier import send_slack_alert
 
 logging.basicConfig(
@@ -33,6 +34,8 @@ def run():
     display = collector_config.get("search_display", 30)
     delay_ms = collector_config.get("request_delay_ms", 150)
     exclude_keywords = collector_config.get("exclude_keywords", [])
+    cache_ttl = collector_config.get("cache_ttl_seconds", 0)
+    cache_dir = collector_config.get("cache_dir", ".cache/naver_search")
 
     slack_enabled = slack_config.get("enabled", False)
     webhook_url = slack_config.get("webhook_url", "")
@@ -43,98 +46,112 @@ def run():
     products = models.get_active_products(client)
     logger.info(f"수집 대상 키워드: {len(products)}개")
 
-    # ── 메모리 버퍼 (수집-저장 분리) ──
-    price_buffer: list[dict] = []
-    alert_buffer: list[dict] = []
+    # 최근 24시간 내 알림 발송 상품 (상품별 조회 대신 1회)
+    recently_alerted = models.get_recently_alerted_product_ids(client)
 
+    # ── 검색 결과 공유: 정규화 키가 같은 키워드끼리 묶어 그룹당 1회만 조회 ──
+    # 검색 결과는 그룹 처리가 끝나면 버린다 (실행 내내 들고 있지 않음)
+    groups: dict[str, list[dict]] = {}
     for product in products:
-        keyword = product["keyword"]
-        product_id = product["id"]
-        target_price = product["target_price"]
-
-        logger.info(f"[{keyword}] 수집 시작...")
-
-        # 네이버 쇼핑 API 호출
-        items = search_products(keyword, client_id, client_secret, display=display)
-
-        if not items:
-            logger.warning(f"[{keyword}] 검색 결과 없음")
+        groups.setdefault(normalize_query(product["keyword"]), []).append(product)
+
+    search_cache = SearchCache(cache_dir, cache_ttl) if cache_ttl > 0 else None
+    api_calls = 0
+    cache_hits = 0
+
+    def fetch(query_key: str, keyword: str) -> list[dict]:
+        nonlocal api_calls, cache_hits
+        items = search_cache.get(query_key, display) if search_cache else None
+        if items is not None:
+            cache_hits += 1
+        else:
+            items = search_products(keyword, client_id, client_secret, display=display)
+            api_calls += 1
+            if search_cache and items:
+                search_cache.set(query_key, display, items)
+            # API 호출 간 딜레이
             time.sleep(delay_ms / 1000)
-            continue
+        return items
 
-        # 필터링
-        filtered = filter_products(keyword, items, exclude_keywords=exclude_keywords)
-        logger.info(f"[{keyword}] 검색 {len(items)}건 → 필터 통과 {len(filtered)}건")
+    # ── 메모리 버퍼 (수집-저장 분리) ──
+    price_buffer = PriceRowBuffer()
+    alert_buffer: list[dict] = []
 
-        if not filtered:
-            time.sleep(delay_ms / 1000)
-            continue
-
-        # ── 버퍼에 축적 (네트워크 호출 없음) ──
-        for i, item in enumerate(filtered):
-            # 원본 API 응답에서 매칭되는 raw 데이터 찾기
-            raw = items[i] if i < len(items) else None
-
-            price_buffer.append({
-                "product_id": product_id,
-                "shop_name": item["shop_name"],
-                "price": item["price"],
-                "product_url": item.get("product_url"),
-                "raw_data": json.dumps(raw, ensure_ascii=False) if raw else None,
-            })
-
-        # 최저가 확인 및 알림 체크
-        min_item = min(filtered, key=lambda x: x["price"])
-        min_price = min_item["price"]
-
-        if target_price and min_price <= target_price:
-            # 최근 알림 여부는 DB에서 직접 확인 (읽기 1회)
-            if not models.check_recent_alert(client, product_id):
-                logger.info(f"[{keyword}] 목표가 도달! {min_price:,}원 <= {target_price:,}원")
-
-                # Slack 알림 (즉시 발송)
-                if slack_enabled and webhook_url:
-                    send_slack_alert(
-                        webhook_url=webhook_url,
-                        keyword=keyword,
-                        price=min_price,
-                        target_price=target_price,
-                        shop=min_item["shop_name"],
-                        url=min_item.get("product_url", ""),
-                    )
-
-                # 알림 기록은 버퍼에 추가
-                alert_buffer.append({
-                    "product_id": product_id,
-                    "triggered_price": min_price,
-                    "target_price": target_price,
-                    "shop_name": min_item["shop_name"],
-                })
-
-        # API 호출 간 딜레이
-        time.sleep(delay_ms / 1000)
+    for query_key, group in groups.items():
+        # 네이버 쇼핑 API 호출 (같은 검색어 그룹은 결과 공유)
+        items = fetch(query_key, group[0]["keyword"])
+
+        for product in group:
+            keyword = product["keyword"]
+            product_id = product["id"]
+            target_price = product["target_price"]
+
+            logger.info(f"[{keyword}] 수집 시작...")
+
+            if not items:
+                logger.warning(f"[{keyword}] 검색 결과 없음")
+                continue
+
+            # 필터링 (통과한 원본 응답과 1:1로 짝지어 raw_data로 저장)
+            matched = [raw for raw in items if match_item(keyword, raw, exclude_keywords)]
+            filtered = [to_listing(raw) for raw in matched]
+            logger.info(f"[{keyword}] 검색 {len(items)}건 → 필터 통과 {len(filtered)}건")
+
+            if not filtered:
+                continue
+
+            # ── 버퍼에 축적 (네트워크 호출 없음) ──
+            for raw, item in zip(matched, filtered):
+                price_buffer.append(product_id, item["shop_name"], item["price"], item.get("product_url"), raw)
+
+            # 최저가 확인 및 알림 체크
+            min_item = min(filtered, key=lambda x: x["price"])
+            min_price = min_item["price"]
+
+            if target_price and min_price <= target_price:
+                if product_id not in recently_alerted:
+                    logger.info(f"[{keyword}] 목표가 도달! {min_price:,}원 <= {target_price:,}원")
+
+                    # Slack 알림 (즉시 발송)
+                    if slack_enabled and webhook_url:
+                        send_slack_alert(
+                            webhook_url=webhook_url,
+                            keyword=keyword,
+                            price=min_price,
+                            target_price=target_price,
+                            shop=min_item["shop_name"],
+                            url=min_item.get("product_url", ""),
+                        )
+
+                    # 알림 기록은 버퍼에 추가
+                    recently_alerted.add(product_id)
+                    alert_buffer.append({
+                        "product_id": product_id,
+                        "triggered_price": min_price,
+                        "target_price": target_price,
+                        "shop_name": min_item["shop_name"],
+                    })
 
     # ── 수집 완료: 일괄 DB 저장 ──
     saved_prices = 0
     saved_alerts = 0
 
-    if price_buffer:
-        try:
-            saved_prices = models.insert_price_logs_batch(client, price_buffer)
-            logger.info(f"price_logs 일괄 저장 완료: {saved_prices}건")
-        except Exception as e:
-            logger.error(f"price_logs 일괄 저장 실패: {e}")
-
-    if alert_buffer:
+    if price_buffer or alert_buffer:
         try:
-            saved_alerts = models.insert_alerts_batch(client, alert_buffer)
-            logger.info(f"alerts 일괄 저장 완료: {saved_alerts}건")
-        except Exception as e:
-            logger.error(f"alerts 일괄 저장 실패: {e}")
+            saved_prices, saved_alerts = models.ingest_collection(client, price_buffer, alert_buffer)
+            logger.info(f"일괄 저장 완료: price_logs {saved_prices}건, alerts {saved_alerts}건")
+        except models.IngestError as e:
+            # 앞선 호출분은 이미 커밋됐으므로 실제 저장 건수로 기록한다
+            saved_prices, saved_alerts = e.saved_prices, e.saved_alerts
+            logger.error(
+                f"일괄 저장 실패: price_logs {e.total_prices}건 중 {saved_prices}건, "
+                f"alerts {len(alert_buffer)}건 중 {saved_alerts}건만 저장됨: {e}"
+            )
 
     elapsed = time.time() - start_time
     logger.info(
-        f"수집 완료: {len(products)}개 키워드, "
+        f"수집 완료: {len(products)}개 키워드 → 검색어 {len(groups)}개 "
+        f"(API {api_calls}회, 캐시 {cache_hits}회), "
         f"{saved_prices}건 가격 + {saved_alerts}건 알림 저장, "
         f"{elapsed:.1f}초 소요"
     )
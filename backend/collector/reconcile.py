@@ -0,0 +1,52 @@
+"""대시보드 요약 정합성 점검 (cron 실행 대상).
+
+    python -m backend.collector.reconcile          # 비교만
+    python -m backend.collector.reconcile --fix    # 불일치 시 재구성
+
+불일치가 남아 있으면 종료 코드 1.
+"""
+
+import sys
+import logging
+import argparse
+
+from backend.database import get_supabase
+from backend import models
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+for _noisy in ("httpx", "httpcore", "h2", "hpack", "hpack.hpack", "hpack.table"):
+    logging.getLogger(_noisy).setLevel(logging.WARNING)
+
+
+def run(fix: bool = False) -> bool:
+    """일치하면(또는 재구성했으면) True."""
+    client = get_supabase()
+    rows = models.reconcile_dashboard_summary(client, fix=fix)
+
+    mismatched = [r for r in rows if float(r["stored"]) != float(r["expected"])]
+    for r in rows:
+        mark = "불일치" if r in mismatched else "일치"
+        logger.info(f"{r['metric']}: 저장 {r['stored']} / 재계산 {r['expected']} ({mark})")
+
+    if not mismatched:
+        logger.info("대시보드 요약 정합성 확인 완료")
+        return True
+
+    if any(r["rebuilt"] for r in rows):
+        logger.warning(f"불일치 {len(mismatched)}건 → 파생 테이블 재구성 완료")
+        return True
+
+    logger.error(f"불일치 {len(mismatched)}건 (--fix로 재구성 가능)")
+    return False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="대시보드 요약 정합성 점검")
+    parser.add_argument("--fix", action="store_true", help="불일치 시 파생 테이블 재구성")
+    args = parser.parse_args()
+    sys.exit(0 if run(fix=args.fix) else 1)
@@ -1,12 +1,18 @@
+from __future__ import annotations
+
 import os
+import threading
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import yaml
-from supabase import create_client, Client
+# yaml/supabase는 무거운 import라 실제로 필요할 때 로드한다 (서버리스 콜드스타트 단축).
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 _config = None
 _supabase_client = None
+_supabase_lock = threading.Lock()
 
 
 def _load_config() -> dict:
@@ -37,6 +43,8 @@ def _load_config() -> dict:
                 "search_display": int(os.environ.get("COLLECTOR_DISPLAY", "100")),
                 "request_delay_ms": int(os.environ.get("COLLECTOR_DELAY_MS", "150")),
                 "exclude_keywords": ["세트", "묶음", "박스", "개입"],
+                "cache_ttl_seconds": int(os.environ.get("COLLECTOR_CACHE_TTL", "0")),
+                "cache_dir": os.environ.get("COLLECTOR_CACHE_DIR", ".cache/naver_search"),
             },
             "api": {
                 "host": "0.0.0.0",
@@ -45,11 +53,18 @@ def _load_config() -> dict:
                     "CORS_ORIGINS",
                     "http://localhost:3000,http://localhost:5173"
                 ).split(","),
+                "feed_poll_seconds": float(os.environ.get("FEED_POLL_SECONDS", "5")),
+                # 실시간 피드는 상주 프로세스에서만 동작한다 (Vercel 함수는 기본 off → 프론트 폴링)
+                "live_feed": os.environ.get(
+                    "LIVE_FEED", "false" if os.environ.get("VERCEL") else "true"
+                ).lower() == "true",
             },
         }
         return _config
 
     # 로컬 개발: config.yaml 사용
+    import yaml
+
     config_path = Path(__file__).parent / "config.yaml"
     with open(config_path, "r", encoding="utf-8") as f:
         _config = yaml.safe_load(f)
@@ -59,9 +74,14 @@ def _load_config() -> dict:
 def get_supabase() -> Client:
     global _supabase_client
     if _supabase_client is None:
-        config = _load_config()
-        sb = config["supabase"]
-        _supabase_client = create_client(sb["url"], sb["anon_key"])
+        # 백그라운드 warm-up과 첫 요청(스레드풀)이 동시에 들어와도 한 번만 생성
+        with _supabase_lock:
+            if _supabase_client is None:
+                from supabase import create_client
+
+                config = _load_config()
+                sb = config["supabase"]
+                _supabase_client = create_client(sb["url"], sb["anon_key"])
     return _supabase_client
 
 
@@ -0,0 +1,375 @@
+-- 대시보드 요약 증분 집계
+--
+-- fn_dashboard_summary가 매 호출마다 products/price_logs 전체를 훑던 것을
+-- 트리거로 유지되는 작은 테이블 읽기로 바꾼다.
+--
+--   product_price_state      상품별 첫 수집일 최저가 / 최신 수집일 최저가 (price_logs INSERT 시 갱신)
+--   daily_collection_counts  수집일별 건수 (price_logs INSERT/DELETE 시 갱신)
+--   dashboard_summary        단일 행 카운터 (products / product_price_state 변경 시 증감)
+--
+-- 정합성 검증/복구: fn_dashboard_summary_reconcile(p_fix)
+--   python -m backend.collector.reconcile [--fix]
+
+
+-- ---------------------------------------------------------------------------
+-- Tables
+-- ---------------------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS product_price_state (
+    product_id   bigint  PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE,
+    first_date   date    NOT NULL,
+    first_price  integer NOT NULL,
+    latest_date  date    NOT NULL,
+    min_price    integer NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS daily_collection_counts (
+    day              date   PRIMARY KEY,
+    collected_count  bigint NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS dashboard_summary (
+    id                  smallint    PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    total_products      integer     NOT NULL DEFAULT 0,
+    goal_reached_count  integer     NOT NULL DEFAULT 0,
+    saving_rate_sum     numeric     NOT NULL DEFAULT 0,
+    saving_rate_n       integer     NOT NULL DEFAULT 0,
+    updated_at          timestamptz NOT NULL DEFAULT now()
+);
+
+INSERT INTO dashboard_summary (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
+
+
+-- ---------------------------------------------------------------------------
+-- 증감 헬퍼: 상품 하나의 목표가 도달 / 절감율 기여분을 p_sign(+1/-1)만큼 반영
+-- 절감율 = (첫 수집일 최저가 - 최신 수집일 최저가) / 첫 수집일 최저가 * 100
+-- ---------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION _summary_apply(
+    p_sign integer, p_active boolean, p_target integer, p_min integer, p_first integer
+) RETURNS void
+LANGUAGE sql AS $$
+    UPDATE dashboard_summary SET
+        goal_reached_count = goal_reached_count
+            + CASE WHEN p_active AND p_min <= p_target THEN p_sign ELSE 0 END,
+        saving_rate_sum = saving_rate_sum
+            + CASE WHEN p_active AND p_first > 0 THEN p_sign * (p_first - p_min)::numeric / p_first * 100 ELSE 0 END,
+        saving_rate_n = saving_rate_n
+            + CASE WHEN p_active AND p_first > 0 THEN p_sign ELSE 0 END,
+        updated_at = now()
+    WHERE id = 1;
+$$;
+
+
+-- ---------------------------------------------------------------------------
+-- Triggers
+-- ---------------------------------------------------------------------------
+
+-- price_logs 배치 INSERT 1회당 한 번 실행 (transition table)
+CREATE OR REPLACE FUNCTION trg_price_logs_summary() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO daily_collection_counts AS d (day, collected_count)
+    SELECT collected_at::date, count(*) FROM new_rows GROUP BY 1
+    ON CONFLICT (day) DO UPDATE
+        SET collected_count = d.collected_count + EXCLUDED.collected_count;
+
+    -- 배치 안에서 상품별 첫/최신 수집일 최저가. 첫 수집일 값은 처음 INSERT될 때 정해지고
+    -- 더 이른 날짜의 행이 들어올 때만 바뀐다.
+    WITH daily AS (
+        SELECT product_id, collected_at::date AS day, min(price) AS price
+        FROM new_rows
+        GROUP BY 1, 2
+    ), batch AS (
+        SELECT DISTINCT ON (f.product_id)
+               f.product_id, f.day AS first_date, f.price AS first_price,
+               l.day AS latest_date, l.price AS min_price
+        FROM daily f
+        JOIN LATERAL (
+            SELECT d.day, d.price FROM daily d
+            WHERE d.product_id = f.product_id
+            ORDER BY d.day DESC LIMIT 1
+        ) l ON true
+        ORDER BY f.product_id, f.day
+    )
+    INSERT INTO product_price_state AS s (product_id, first_date, first_price, latest_date, min_price)
+    SELECT product_id, first_date, first_price, latest_date, min_price FROM batch
+    ON CONFLICT (product_id) DO UPDATE SET
+        first_date = LEAST(s.first_date, EXCLUDED.first_date),
+        first_price = CASE WHEN EXCLUDED.first_date < s.first_date THEN EXCLUDED.first_price
+                           WHEN EXCLUDED.first_date = s.first_date THEN LEAST(s.first_price, EXCLUDED.first_price)
+                           ELSE s.first_price END,
+        latest_date = GREATEST(s.latest_date, EXCLUDED.latest_date),
+        min_price = CASE WHEN EXCLUDED.latest_date > s.latest_date THEN EXCLUDED.min_price
+                         WHEN EXCLUDED.latest_date = s.latest_date THEN LEAST(s.min_price, EXCLUDED.min_price)
+                         ELSE s.min_price END
+    WHERE EXCLUDED.first_date <= s.first_date OR EXCLUDED.latest_date >= s.latest_date;
+
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS price_logs_summary ON price_logs;
+CREATE TRIGGER price_logs_summary
+    AFTER INSERT ON price_logs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_price_logs_summary();
+
+
+-- 삭제(상품 CASCADE 포함) 시 일별 건수만 차감. 최신일 상태는 reconcile/rebuild가 맞춘다.
+CREATE OR REPLACE FUNCTION trg_price_logs_summary_delete() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    UPDATE daily_collection_counts d
+    SET collected_count = d.collected_count - o.cnt
+    FROM (SELECT collected_at::date AS day, count(*) AS cnt FROM old_rows GROUP BY 1) o
+    WHERE d.day = o.day;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS price_logs_summary_delete ON price_logs;
+CREATE TRIGGER price_logs_summary_delete
+    AFTER DELETE ON price_logs
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_price_logs_summary_delete();
+
+
+-- 최신일 가격 상태가 바뀌면 해당 상품 기여분 교체.
+-- 상품 삭제로 CASCADE된 경우 products 행이 없으므로 건너뛴다 (products 트리거가 처리).
+CREATE OR REPLACE FUNCTION trg_price_state_summary() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    p products%ROWTYPE;
+BEGIN
+    SELECT * INTO p FROM products WHERE id = COALESCE(NEW.product_id, OLD.product_id);
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM _summary_apply(-1, p.is_active, p.target_price, OLD.min_price, OLD.first_price);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM _summary_apply(1, p.is_active, p.target_price, NEW.min_price, NEW.first_price);
+    END IF;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS price_state_summary ON product_price_state;
+CREATE TRIGGER price_state_summary
+    AFTER INSERT OR UPDATE OR DELETE ON product_price_state
+    FOR EACH ROW EXECUTE FUNCTION trg_price_state_summary();
+
+
+-- 상품 등록/수정/삭제. 삭제는 CASCADE 전에 상태를 읽어야 하므로 BEFORE DELETE.
+CREATE OR REPLACE FUNCTION trg_products_summary() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    s product_price_state%ROWTYPE;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT * INTO s FROM product_price_state WHERE product_id = OLD.id;
+        PERFORM _summary_apply(-1, OLD.is_active, OLD.target_price, s.min_price, s.first_price);
+        UPDATE dashboard_summary
+            SET total_products = total_products - CASE WHEN OLD.is_active THEN 1 ELSE 0 END
+            WHERE id = 1;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT * INTO s FROM product_price_state WHERE product_id = NEW.id;
+        PERFORM _summary_apply(1, NEW.is_active, NEW.target_price, s.min_price, s.first_price);
+        UPDATE dashboard_summary
+            SET total_products = total_products + CASE WHEN NEW.is_active THEN 1 ELSE 0 END
+            WHERE id = 1;
+    END IF;
+    IF TG_OP = 'DELETE' THEN
+        RETURN OLD;
+    END IF;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS products_summary ON products;
+CREATE TRIGGER products_summary
+    AFTER INSERT OR UPDATE OF is_active, target_price ON products
+    FOR EACH ROW EXECUTE FUNCTION trg_products_summary();
+
+DROP TRIGGER IF EXISTS products_summary_delete ON products;
+CREATE TRIGGER products_summary_delete
+    BEFORE DELETE ON products
+    FOR EACH ROW EXECUTE FUNCTION trg_products_summary();
+
+
+-- ---------------------------------------------------------------------------
+-- Read path: O(1)
+-- ---------------------------------------------------------------------------
+
+DROP FUNCTION IF EXISTS fn_dashboard_summary();
+CREATE FUNCTION fn_dashboard_summary()
+RETURNS TABLE (
+    total_products        integer,
+    goal_reached_count    integer,
+    today_collected_count bigint,
+    avg_saving_rate       numeric
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        s.total_products,
+        s.goal_reached_count,
+        COALESCE((SELECT d.collected_count FROM daily_collection_counts d WHERE d.day = current_date), 0),
+        CASE WHEN s.saving_rate_n > 0 THEN round(s.saving_rate_sum / s.saving_rate_n, 1) ELSE 0 END
+    FROM dashboard_summary s
+    WHERE s.id = 1;
+$$;
+
+
+-- ---------------------------------------------------------------------------
+-- Full recompute / reconciliation
+-- ---------------------------------------------------------------------------
+
+-- 원본 테이블에서 직접 계산. supabase_migration.sql의 기존 fn_dashboard_summary 본문 그대로
+-- (반환 타입만 새 fn_dashboard_summary에 맞춤).
+CREATE OR REPLACE FUNCTION fn_dashboard_summary_recompute()
+RETURNS TABLE (
+    total_products        integer,
+    goal_reached_count    integer,
+    today_collected_count bigint,
+    avg_saving_rate       numeric
+)
+LANGUAGE plpgsql STABLE AS $$
+DECLARE
+    v_total      BIGINT;
+    v_goal       BIGINT;
+    v_today      BIGINT;
+    v_avg_saving NUMERIC;
+BEGIN
+    -- 활성 상품 수
+    SELECT COUNT(*) INTO v_total
+    FROM products WHERE is_active = TRUE;
+
+    -- 목표 달성 수: 최신 최저가 <= target_price
+    SELECT COUNT(*) INTO v_goal
+    FROM products p
+    WHERE p.target_price IS NOT NULL
+      AND p.is_active = TRUE
+      AND EXISTS (
+          SELECT 1 FROM price_logs pl
+          WHERE pl.product_id = p.id
+            AND pl.collected_at::date = (
+                SELECT MAX(pl2.collected_at)::date
+                FROM price_logs pl2
+                WHERE pl2.product_id = p.id
+            )
+            AND pl.price <= p.target_price
+      );
+
+    -- 오늘 수집 건수
+    SELECT COUNT(*) INTO v_today
+    FROM price_logs
+    WHERE collected_at::date = CURRENT_DATE;
+
+    -- 평균 절약률
+    SELECT COALESCE(ROUND(AVG(saving_rate), 1), 0) INTO v_avg_saving
+    FROM (
+        SELECT
+            (first_p.fprice - latest_p.lprice)::NUMERIC
+                / NULLIF(first_p.fprice, 0) * 100 AS saving_rate
+        FROM products p
+        INNER JOIN LATERAL (
+            SELECT MIN(pl.price) AS lprice
+            FROM price_logs pl
+            WHERE pl.product_id = p.id
+              AND pl.collected_at::date = (
+                  SELECT MAX(pl2.collected_at)::date
+                  FROM price_logs pl2
+                  WHERE pl2.product_id = p.id
+              )
+        ) latest_p ON latest_p.lprice IS NOT NULL
+        INNER JOIN LATERAL (
+            SELECT MIN(pl.price) AS fprice
+            FROM price_logs pl
+            WHERE pl.product_id = p.id
+              AND pl.collected_at::date = (
+                  SELECT MIN(pl2.collected_at)::date
+                  FROM price_logs pl2
+                  WHERE pl2.product_id = p.id
+              )
+        ) first_p ON first_p.fprice IS NOT NULL AND first_p.fprice > 0
+        WHERE p.is_active = TRUE
+    ) rates;
+
+    RETURN QUERY SELECT v_total::integer, v_goal::integer, v_today, v_avg_saving;
+END;
+$$;
+
+
+-- price_logs에서 product_price_state 행을 계산 (p_product_ids가 NULL이면 전체)
+CREATE OR REPLACE FUNCTION fn_product_price_state_source(p_product_ids bigint[])
+RETURNS TABLE (product_id bigint, first_date date, first_price integer, latest_date date, min_price integer)
+LANGUAGE sql STABLE AS $$
+    WITH daily AS (
+        SELECT l.product_id, l.collected_at::date AS day, min(l.price) AS price
+        FROM price_logs l
+        WHERE p_product_ids IS NULL OR l.product_id = ANY(p_product_ids)
+        GROUP BY 1, 2
+    )
+    SELECT DISTINCT ON (f.product_id)
+           f.product_id, f.day, f.price, l.day, l.price
+    FROM daily f
+    JOIN LATERAL (
+        SELECT d.day, d.price FROM daily d
+        WHERE d.product_id = f.product_id
+        ORDER BY d.day DESC LIMIT 1
+    ) l ON true
+    ORDER BY f.product_id, f.day;
+$$;
+
+
+-- 파생 테이블을 원본에서 다시 만든다. 카운터는 트리거를 통해 다시 누적된다.
+CREATE OR REPLACE FUNCTION fn_dashboard_summary_rebuild() RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    LOCK TABLE product_price_state, daily_collection_counts, dashboard_summary IN EXCLUSIVE MODE;
+
+    TRUNCATE product_price_state, daily_collection_counts;
+    UPDATE dashboard_summary SET
+        total_products = (SELECT count(*) FROM products WHERE is_active),
+        goal_reached_count = 0,
+        saving_rate_sum = 0,
+        saving_rate_n = 0,
+        updated_at = now()
+    WHERE id = 1;
+
+    INSERT INTO daily_collection_counts (day, collected_count)
+    SELECT collected_at::date, count(*) FROM price_logs GROUP BY 1;
+
+    INSERT INTO product_price_state (product_id, first_date, first_price, latest_date, min_price)
+    SELECT product_id, first_date, first_price, latest_date, min_price
+    FROM fn_product_price_state_source(NULL);
+END $$;
+
+
+-- 저장된 값과 전체 재계산 값을 비교. p_fix = true이고 불일치가 있으면 rebuild.
+CREATE OR REPLACE FUNCTION fn_dashboard_summary_reconcile(p_fix boolean DEFAULT false)
+RETURNS TABLE (metric text, stored numeric, expected numeric, rebuilt boolean)
+LANGUAGE plpgsql AS $$
+DECLARE
+    cur record;
+    exp record;
+    mismatch boolean;
+BEGIN
+    SELECT * INTO cur FROM fn_dashboard_summary();
+    SELECT * INTO exp FROM fn_dashboard_summary_recompute();
+
+    mismatch := (cur.total_products, cur.goal_reached_count, cur.today_collected_count, cur.avg_saving_rate)
+        IS DISTINCT FROM (exp.total_products, exp.goal_reached_count, exp.today_collected_count, exp.avg_saving_rate);
+    IF mismatch AND p_fix THEN
+        PERFORM fn_dashboard_summary_rebuild();
+    END IF;
+
+    RETURN QUERY VALUES
+        ('total_products',        cur.total_products::numeric,        exp.total_products::numeric,        mismatch AND p_fix),
+        ('goal_reached_count',    cur.goal_reached_count::numeric,    exp.goal_reached_count::numeric,    mismatch AND p_fix),
+        ('today_collected_count', cur.today_collected_count::numeric, exp.today_collected_count::numeric, mismatch AND p_fix),
+        ('avg_saving_rate',       cur.avg_saving_rate,                exp.avg_saving_rate,                mismatch AND p_fix);
+END $$;
+
+
+-- 기존 데이터로 초기 적재
+SELECT fn_dashboard_summary_rebuild();
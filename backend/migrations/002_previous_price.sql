@@ -0,0 +1,151 @@
+-- 직전 가격을 저장 시점에 기록
+--
+-- fn_recent_collections가 행마다 (product_id, shop_name) 직전 가격을
+-- ORDER BY ... LIMIT 1 서브쿼리로 찾던 것을 없앤다.
+--
+--   shop_last_prices          (product_id, shop_name)별 마지막 수집 가격 맵
+--                             (previous_price는 그 직전 회차 가격. 한 회차가 여러 문장으로 나뉘어
+--                              들어와도 뒤 문장의 행이 직전 회차 가격을 찾을 수 있게 한다)
+--   price_logs.previous_price INSERT 시 맵에서 채움 (첫 수집이면 NULL)
+--
+-- 같은 수집 회차에 한 쇼핑몰의 상품이 여러 건이면 그 회차의 최저가를 맵에 남긴다.
+
+
+-- ---------------------------------------------------------------------------
+-- Schema
+-- ---------------------------------------------------------------------------
+
+ALTER TABLE price_logs ADD COLUMN IF NOT EXISTS previous_price integer;
+
+CREATE TABLE IF NOT EXISTS shop_last_prices (
+    product_id    bigint      NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    shop_name     text        NOT NULL,
+    price           integer     NOT NULL,
+    previous_price  integer,
+    collected_at    timestamptz NOT NULL,
+    PRIMARY KEY (product_id, shop_name)
+);
+
+CREATE INDEX IF NOT EXISTS idx_price_logs_collected_id ON price_logs (collected_at DESC, id DESC);
+
+
+-- ---------------------------------------------------------------------------
+-- Triggers
+-- ---------------------------------------------------------------------------
+
+-- 행마다 PK 조회 1회. 맵은 문장 단위 트리거에서 갱신되므로
+-- 같은 배치 안의 행끼리는 서로의 가격을 직전 가격으로 보지 않는다.
+CREATE OR REPLACE FUNCTION trg_price_logs_previous_price() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF NEW.previous_price IS NULL THEN
+        SELECT CASE WHEN s.collected_at < NEW.collected_at THEN s.price ELSE s.previous_price END
+        INTO NEW.previous_price
+        FROM shop_last_prices s
+        WHERE s.product_id = NEW.product_id
+          AND s.shop_name = NEW.shop_name
+          AND s.collected_at <= NEW.collected_at;
+    END IF;
+    RETURN NEW;
+END $$;
+
+DROP TRIGGER IF EXISTS price_logs_previous_price ON price_logs;
+CREATE TRIGGER price_logs_previous_price
+    BEFORE INSERT ON price_logs
+    FOR EACH ROW EXECUTE FUNCTION trg_price_logs_previous_price();
+
+
+CREATE OR REPLACE FUNCTION trg_price_logs_last_price() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO shop_last_prices AS s (product_id, shop_name, price, previous_price, collected_at)
+    SELECT DISTINCT ON (product_id, shop_name)
+           product_id, shop_name, min(price) OVER w, previous_price, collected_at
+    FROM new_rows
+    WINDOW w AS (PARTITION BY product_id, shop_name, collected_at)
+    ORDER BY product_id, shop_name, collected_at DESC
+    ON CONFLICT (product_id, shop_name) DO UPDATE SET
+        price = CASE WHEN EXCLUDED.collected_at = s.collected_at
+                     THEN LEAST(s.price, EXCLUDED.price) ELSE EXCLUDED.price END,
+        previous_price = CASE WHEN EXCLUDED.collected_at = s.collected_at
+                              THEN s.previous_price ELSE s.price END,
+        collected_at = EXCLUDED.collected_at
+    WHERE EXCLUDED.collected_at >= s.collected_at;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS price_logs_last_price ON price_logs;
+CREATE TRIGGER price_logs_last_price
+    AFTER INSERT ON price_logs
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION trg_price_logs_last_price();
+
+
+-- ---------------------------------------------------------------------------
+-- 기존 데이터 채우기 (1회)
+-- ---------------------------------------------------------------------------
+
+WITH runs AS (
+    SELECT product_id, shop_name, collected_at, min(price) AS price
+    FROM price_logs
+    GROUP BY product_id, shop_name, collected_at
+), prev AS (
+    SELECT product_id, shop_name, collected_at,
+           lag(price) OVER (PARTITION BY product_id, shop_name ORDER BY collected_at) AS previous_price
+    FROM runs
+)
+UPDATE price_logs l
+SET previous_price = prev.previous_price
+FROM prev
+WHERE l.product_id = prev.product_id
+  AND l.shop_name = prev.shop_name
+  AND l.collected_at = prev.collected_at
+  AND l.previous_price IS NULL
+  AND prev.previous_price IS NOT NULL;
+
+-- price_logs에서 shop_last_prices 행을 계산 (p_product_ids가 NULL이면 전체)
+CREATE OR REPLACE FUNCTION fn_shop_last_prices_source(p_product_ids bigint[])
+RETURNS TABLE (product_id bigint, shop_name text, price integer, previous_price integer, collected_at timestamptz)
+LANGUAGE sql STABLE AS $$
+    WITH runs AS (
+        SELECT l.product_id, l.shop_name, l.collected_at, min(l.price) AS price
+        FROM price_logs l
+        WHERE p_product_ids IS NULL OR l.product_id = ANY(p_product_ids)
+        GROUP BY 1, 2, 3
+    )
+    SELECT DISTINCT ON (r.product_id, r.shop_name)
+           r.product_id, r.shop_name, r.price,
+           lag(r.price) OVER (PARTITION BY r.product_id, r.shop_name ORDER BY r.collected_at),
+           r.collected_at
+    FROM runs r
+    ORDER BY r.product_id, r.shop_name, r.collected_at DESC;
+$$;
+
+INSERT INTO shop_last_prices (product_id, shop_name, price, previous_price, collected_at)
+SELECT * FROM fn_shop_last_prices_source(NULL)
+ON CONFLICT (product_id, shop_name) DO NOTHING;
+
+
+-- ---------------------------------------------------------------------------
+-- Read path
+-- ---------------------------------------------------------------------------
+
+DROP FUNCTION IF EXISTS fn_recent_collections(integer);
+CREATE FUNCTION fn_recent_collections(p_limit integer DEFAULT 10)
+RETURNS TABLE (
+    id              bigint,
+    product_name    text,
+    shop            text,
+    price           integer,
+    previous_price  integer,
+    collected_at    timestamptz
+)
+LANGUAGE sql STABLE AS $$
+    SELECT l.id, p.keyword, l.shop_name, l.price,
+           COALESCE(l.previous_price, l.price), l.collected_at
+    FROM price_logs l
+    JOIN products p ON p.id = l.product_id
+    ORDER BY l.collected_at DESC, l.id DESC
+    LIMIT p_limit;
+$$;
+
@@ -0,0 +1,25 @@
+-- price_logs 컬럼 배열 INSERT
+--
+-- 수집기의 PriceRowBuffer가 행 dict 대신 컬럼 배열을 보내면 unnest로 풀어 한 문장으로 적재한다.
+-- (문장 단위 트리거는 배치당 한 번 실행된다)
+-- p_collected_at을 주면 모든 행의 collected_at으로 쓴다 (여러 호출로 나눈 한 수집 회차를 같은 시각으로 묶기 위해).
+
+DROP FUNCTION IF EXISTS fn_insert_price_logs(bigint[], text[], integer[], text[], text[]);
+
+CREATE OR REPLACE FUNCTION fn_insert_price_logs(
+    p_product_id    bigint[],
+    p_shop_name     text[],
+    p_price         integer[],
+    p_product_url   text[],
+    p_raw_data      text[],
+    p_collected_at  timestamptz DEFAULT NULL
+) RETURNS integer
+LANGUAGE sql AS $$
+    WITH ins AS (
+        INSERT INTO price_logs (product_id, shop_name, price, product_url, raw_data, collected_at)
+        SELECT u.*, COALESCE(p_collected_at, now())
+        FROM unnest(p_product_id, p_shop_name, p_price, p_product_url, p_raw_data::jsonb[]) AS u
+        RETURNING 1
+    )
+    SELECT count(*)::integer FROM ins;
+$$;
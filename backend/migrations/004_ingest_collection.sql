@@ -0,0 +1,47 @@
+-- 수집 결과 단일 RPC 적재
+--
+-- 한 번의 수집 실행에서 모은 가격 행과 알림 행을 컬럼 배열로 받아 한 트랜잭션에서 INSERT한다.
+-- 파생 테이블(product_price_state, daily_collection_counts, dashboard_summary, shop_last_prices)은
+-- price_logs 트리거가 같은 트랜잭션 안에서 갱신한다.
+--
+-- 한 회차가 여러 호출로 나뉘면 첫 호출이 돌려준 collected_at을 이후 호출의 p_collected_at으로 넘긴다.
+-- 회차 전체가 같은 collected_at을 가지므로 뒤 청크가 앞 청크 가격을 previous_price로 보지 않고,
+-- 시각 기준 조회에서도 한 회차로 묶인다.
+
+DROP FUNCTION IF EXISTS fn_ingest_collection(bigint[], text[], integer[], text[], text[], bigint[], integer[], integer[], text[]);
+
+CREATE OR REPLACE FUNCTION fn_ingest_collection(
+    p_product_id             bigint[],
+    p_shop_name              text[],
+    p_price                  integer[],
+    p_product_url            text[],
+    p_raw_data               text[],
+    p_alert_product_id       bigint[]  DEFAULT '{}',
+    p_alert_triggered_price  integer[] DEFAULT '{}',
+    p_alert_target_price     integer[] DEFAULT '{}',
+    p_alert_shop_name        text[]    DEFAULT '{}',
+    p_collected_at           timestamptz DEFAULT NULL
+) RETURNS TABLE (price_count integer, alert_count integer, collected_at timestamptz)
+LANGUAGE plpgsql AS $$
+BEGIN
+    collected_at := COALESCE(p_collected_at, now());
+    price_count := fn_insert_price_logs(p_product_id, p_shop_name, p_price, p_product_url, p_raw_data, collected_at);
+
+    INSERT INTO alerts (product_id, triggered_price, target_price, shop_name)
+    SELECT * FROM unnest(p_alert_product_id, p_alert_triggered_price, p_alert_target_price, p_alert_shop_name);
+    GET DIAGNOSTICS alert_count = ROW_COUNT;
+
+    RETURN NEXT;
+END $$;
+
+
+-- 최근 N시간 안에 알림이 나간 상품 id 목록 (수집 시작 시 1회 조회)
+CREATE OR REPLACE FUNCTION fn_recently_alerted_products(p_hours integer DEFAULT 24)
+RETURNS TABLE (product_id bigint)
+LANGUAGE sql STABLE AS $$
+    SELECT DISTINCT a.product_id
+    FROM alerts a
+    WHERE a.notified_at >= now() - make_interval(hours => p_hours);
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_alerts_notified ON alerts (notified_at);
@@ -0,0 +1,219 @@
+-- 키워드 검색 인덱스
+--
+-- fn_products_with_prices의 ILIKE '%검색어%' 순차 스캔을 대체한다.
+--
+--   fn_search_key(text)     소문자 + 공백 제거 + 한글 음절을 자모로 분해 ('콜라' → 'ㅋㅗㄹㄹㅏ')
+--                           겹자모도 분해해서 입력 중인 글자('닭' 입력 중 '달')도 접두어로 맞는다.
+--   products.search_key     위 키 (generated column, 접두어 검색용 btree)
+--   product_search_grams    search_key 3-gram 역색인 (products 등록/수정 시 트리거로 갱신, 삭제 시 CASCADE)
+--
+-- 순위: 접두어 일치(+2) > 부분 일치(+1) > 검색어 3-gram 적중 비율(0~1)
+-- 찾는 범위는 기존 ILIKE '%검색어%'를 포함한다 (짧은 검색어는 부분 일치로 대체).
+
+
+-- ---------------------------------------------------------------------------
+-- Search key
+-- ---------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION fn_search_key(p_text text) RETURNS text
+LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE AS $$
+DECLARE
+    cho  text[] := ARRAY['ㄱ','ㄲ','ㄴ','ㄷ','ㄸ','ㄹ','ㅁ','ㅂ','ㅃ','ㅅ','ㅆ','ㅇ','ㅈ','ㅉ','ㅊ','ㅋ','ㅌ','ㅍ','ㅎ'];
+    jung text[] := ARRAY['ㅏ','ㅐ','ㅑ','ㅒ','ㅓ','ㅔ','ㅕ','ㅖ','ㅗ','ㅗㅏ','ㅗㅐ','ㅗㅣ','ㅛ','ㅜ','ㅜㅓ','ㅜㅔ','ㅜㅣ','ㅠ','ㅡ','ㅡㅣ','ㅣ'];
+    jong text[] := ARRAY['','ㄱ','ㄲ','ㄱㅅ','ㄴ','ㄴㅈ','ㄴㅎ','ㄷ','ㄹ','ㄹㄱ','ㄹㅁ','ㄹㅂ','ㄹㅅ','ㄹㅌ','ㄹㅍ','ㄹㅎ',
+                         'ㅁ','ㅂ','ㅂㅅ','ㅅ','ㅆ','ㅇ','ㅈ','ㅊ','ㅋ','ㅌ','ㅍ','ㅎ'];
+    src  text := regexp_replace(lower(COALESCE(p_text, '')), '\s+', '', 'g');
+    out  text := '';
+    ch   text;
+    code integer;
+BEGIN
+    FOREACH ch IN ARRAY regexp_split_to_array(src, '') LOOP
+        code := ascii(ch) - 44032;  -- U+AC00 '가'
+        IF code BETWEEN 0 AND 11171 THEN
+            out := out || cho[code / 588 + 1] || jung[(code % 588) / 28 + 1] || jong[code % 28 + 1];
+        ELSE
+            out := out || ch;
+        END IF;
+    END LOOP;
+    RETURN out;
+END $$;
+
+
+CREATE OR REPLACE FUNCTION fn_search_grams(p_key text) RETURNS SETOF text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT DISTINCT substr(p_key, i, 3)
+    FROM generate_series(1, length(p_key) - 2) AS i;
+$$;
+
+
+-- ---------------------------------------------------------------------------
+-- Index
+-- ---------------------------------------------------------------------------
+
+ALTER TABLE products
+    ADD COLUMN IF NOT EXISTS search_key text GENERATED ALWAYS AS (fn_search_key(keyword)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_products_search_key ON products (search_key text_pattern_ops);
+
+CREATE TABLE IF NOT EXISTS product_search_grams (
+    gram        text   NOT NULL,
+    product_id  bigint NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+    PRIMARY KEY (gram, product_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_product_search_grams_product ON product_search_grams (product_id);
+
+
+CREATE OR REPLACE FUNCTION trg_products_search_grams() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        DELETE FROM product_search_grams WHERE product_id = NEW.id;
+    END IF;
+    INSERT INTO product_search_grams (gram, product_id)
+    SELECT g, NEW.id FROM fn_search_grams(NEW.search_key) AS g;
+    RETURN NULL;
+END $$;
+
+DROP TRIGGER IF EXISTS products_search_grams ON products;
+CREATE TRIGGER products_search_grams
+    AFTER INSERT OR UPDATE OF keyword ON products
+    FOR EACH ROW EXECUTE FUNCTION trg_products_search_grams();
+
+-- 기존 상품 색인
+INSERT INTO product_search_grams (gram, product_id)
+SELECT g, p.id FROM products p, fn_search_grams(p.search_key) AS g
+ON CONFLICT DO NOTHING;
+
+
+-- ---------------------------------------------------------------------------
+-- Search
+-- ---------------------------------------------------------------------------
+
+-- 검색어 3-gram 적중 비율이 p_min_similarity 이상이거나 접두어/부분 일치인 상품을 순위순으로.
+-- 3-gram이 없는 짧은 검색어(자모 2자 이하, 예: '24', 'ml')는 부분 일치(strpos)로 찾는다.
+-- 부분 일치하는 상품은 검색어 3-gram을 모두 가지므로 기존 ILIKE '%검색어%' 결과를 모두 포함한다.
+-- p_limit이 NULL이면 자르지 않는다.
+--
+-- 검색 키를 변수로 먼저 계산해 두고, 접두어 조건은 text_pattern_ops 범위 연산자(~>=~ / ~<~)로 써서
+-- 계획 시점에 상수가 아니어도 idx_products_search_key를 탄다 (LIKE 변수 || '%'는 인덱스를 못 쓴다).
+CREATE OR REPLACE FUNCTION fn_search_products(
+    p_query           text,
+    p_limit           integer DEFAULT NULL,
+    p_min_similarity  real    DEFAULT 0.5
+) RETURNS TABLE (product_id bigint, search_rank real)
+LANGUAGE plpgsql STABLE AS $$
+#variable_conflict use_column
+DECLARE
+    v_key    text   := fn_search_key(p_query);
+    v_grams  text[] := ARRAY(SELECT fn_search_grams(fn_search_key(p_query)));
+    v_n      integer;
+BEGIN
+    v_n := cardinality(v_grams);
+    IF v_key = '' THEN
+        RETURN;
+    END IF;
+
+    RETURN QUERY
+    WITH gram_hits AS (
+        SELECT s.product_id, count(*) AS hits
+        FROM product_search_grams s
+        WHERE s.gram = ANY(v_grams)
+        GROUP BY s.product_id
+    ),
+    prefix_hits AS (
+        SELECT p.id AS product_id
+        FROM products p
+        WHERE p.search_key ~>=~ v_key
+          AND p.search_key ~<~ (v_key || chr(1114111))
+          AND starts_with(p.search_key, v_key)
+    ),
+    short_hits AS (
+        SELECT p.id AS product_id
+        FROM products p
+        WHERE v_n = 0 AND strpos(p.search_key, v_key) > 0
+    ),
+    candidates AS (
+        SELECT gh.product_id FROM gram_hits gh
+        UNION
+        SELECT ph.product_id FROM prefix_hits ph
+        UNION
+        SELECT sh.product_id FROM short_hits sh
+    ),
+    scored AS (
+        SELECT p.id AS product_id,
+               length(p.search_key) AS key_len,
+               (CASE WHEN ph.product_id IS NOT NULL THEN 2 ELSE 0 END
+                + CASE WHEN strpos(p.search_key, v_key) > 0 THEN 1 ELSE 0 END
+                + CASE WHEN v_n > 0 THEN COALESCE(gh.hits, 0)::real / v_n ELSE 0 END
+               )::real AS search_rank,
+               CASE WHEN v_n > 0 THEN COALESCE(gh.hits, 0)::real / v_n ELSE 0 END AS similarity
+        FROM candidates c
+        JOIN products p ON p.id = c.product_id
+        LEFT JOIN gram_hits gh ON gh.product_id = c.product_id
+        LEFT JOIN prefix_hits ph ON ph.product_id = c.product_id
+    )
+    SELECT sc.product_id, sc.search_rank
+    FROM scored sc
+    WHERE sc.search_rank >= 1 OR sc.similarity >= p_min_similarity
+    ORDER BY sc.search_rank DESC, sc.key_len, sc.product_id
+    LIMIT p_limit;
+END $$;
+
+
+-- fn_products_with_prices와 같은 컬럼/같은 정의를 검색 결과 상품에 대해서만 계산 (순위순).
+-- latest_price는 최신 수집일 최저가, prev_price는 그 전 수집일 최저가.
+CREATE OR REPLACE FUNCTION fn_search_products_with_prices(
+    p_query  text,
+    p_limit  integer DEFAULT NULL
+) RETURNS TABLE (
+    id                   bigint,
+    keyword              text,
+    target_price         integer,
+    memo                 text,
+    is_active            boolean,
+    created_at           timestamptz,
+    updated_at           timestamptz,
+    latest_price         integer,
+    latest_shop          text,
+    latest_url           text,
+    latest_collected_at  timestamptz,
+    prev_price           integer,
+    search_rank          real
+)
+LANGUAGE sql STABLE AS $$
+    SELECT p.id, p.keyword, p.target_price, p.memo, p.is_active, p.created_at, p.updated_at,
+           lp.price, lp.shop_name, lp.product_url, lp.collected_at,
+           pp.price,
+           s.search_rank
+    FROM fn_search_products(p_query, p_limit) s
+    JOIN products p ON p.id = s.product_id
+    LEFT JOIN LATERAL (
+        SELECT pl.price, pl.shop_name, pl.product_url, pl.collected_at
+        FROM price_logs pl
+        WHERE pl.product_id = p.id
+          AND pl.collected_at::date = (
+              SELECT MAX(pl2.collected_at)::date
+              FROM price_logs pl2
+              WHERE pl2.product_id = p.id
+          )
+        ORDER BY pl.price ASC
+        LIMIT 1
+    ) lp ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT MIN(pl3.price) AS price
+        FROM price_logs pl3
+        WHERE pl3.product_id = p.id
+          AND pl3.collected_at::date = (
+              SELECT MAX(pl4.collected_at)::date
+              FROM price_logs pl4
+              WHERE pl4.product_id = p.id
+                AND pl4.collected_at::date < (
+                    SELECT MAX(pl5.collected_at)::date
+                    FROM price_logs pl5
+                    WHERE pl5.product_id = p.id
+                )
+          )
+    ) pp ON TRUE
+    ORDER BY s.search_rank DESC, length(p.search_key), p.id;
+$$;
@@ -0,0 +1,89 @@
+-- 상품 일괄 등록/수정 + 여러 상품 가격 일괄 조회
+
+
+-- ---------------------------------------------------------------------------
+-- 일괄 upsert: 키워드 기준. 기존 상품은 값이 주어진(NULL 아님) 필드만 갱신한다.
+-- 배열 순서대로 (ord, id, created) 반환. 같은 호출 안의 중복 키워드는 호출 측에서 걸러서 보낸다.
+-- ---------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION fn_upsert_products(
+    p_keyword       text[],
+    p_target_price  integer[],
+    p_memo          text[]
+) RETURNS TABLE (ord integer, id bigint, created boolean)
+LANGUAGE sql AS $$
+    WITH src AS (
+        SELECT s.ord::integer, s.keyword, s.target_price, s.memo
+        FROM unnest(p_keyword, p_target_price, p_memo) WITH ORDINALITY AS s(keyword, target_price, memo, ord)
+    ),
+    upserted AS (
+        INSERT INTO products AS p (keyword, target_price, memo)
+        SELECT keyword, target_price, memo FROM src
+        ON CONFLICT (keyword) DO UPDATE SET
+            target_price = COALESCE(EXCLUDED.target_price, p.target_price),
+            memo = COALESCE(EXCLUDED.memo, p.memo),
+            updated_at = now()
+        RETURNING p.id, p.keyword, (xmax = 0) AS created
+    )
+    SELECT src.ord, u.id, u.created
+    FROM src JOIN upserted u ON u.keyword = src.keyword
+    ORDER BY src.ord;
+$$;
+
+
+-- ---------------------------------------------------------------------------
+-- 여러 상품의 최신 최저가 + 기간 통계를 한 번에. 요청한 id 순서대로 반환 (없는 id는 제외).
+-- 통계는 fn_price_stats를 상품마다 그대로 호출해 /prices/{id}/stats와 같은 값을 낸다.
+-- 최신 최저가는 fn_products_with_prices와 같은 정의 (최신 수집일의 최저가 행).
+-- ---------------------------------------------------------------------------
+
+DROP FUNCTION IF EXISTS fn_prices_batch(bigint[], integer);
+
+CREATE FUNCTION fn_prices_batch(
+    p_product_ids  bigint[],
+    p_days         integer DEFAULT 30
+) RETURNS TABLE (
+    product_id              bigint,
+    keyword                 text,
+    latest_price            integer,
+    latest_shop             text,
+    latest_url              text,
+    latest_collected_at     timestamptz,
+    min_price               integer,
+    max_price               integer,
+    avg_price               integer,
+    data_count              bigint,
+    current_price           integer,
+    price_at_start          integer,
+    change_from_start       integer,
+    change_rate_from_start  numeric,
+    lowest_shop             text
+)
+LANGUAGE sql STABLE AS $$
+    WITH ids AS (
+        SELECT DISTINCT ON (u.id) u.id, u.ord
+        FROM unnest(p_product_ids) WITH ORDINALITY AS u(id, ord)
+        ORDER BY u.id, u.ord
+    )
+    SELECT p.id, p.keyword,
+           lp.price, lp.shop_name, lp.product_url, lp.collected_at,
+           st.min_price, st.max_price, st.avg_price, st.data_count,
+           st.current_price, st.price_at_start, st.change_from_start, st.change_rate_from_start,
+           st.lowest_shop
+    FROM ids
+    JOIN products p ON p.id = ids.id
+    LEFT JOIN LATERAL (
+        SELECT pl.price, pl.shop_name, pl.product_url, pl.collected_at
+        FROM price_logs pl
+        WHERE pl.product_id = p.id
+          AND pl.collected_at::date = (
+              SELECT MAX(pl2.collected_at)::date
+              FROM price_logs pl2
+              WHERE pl2.product_id = p.id
+          )
+        ORDER BY pl.price ASC
+        LIMIT 1
+    ) lp ON TRUE
+    CROSS JOIN LATERAL fn_price_stats(p.id, p_days) st
+    ORDER BY ids.ord;
+$$;
@@ -0,0 +1,100 @@
+-- 저장된 raw_data 재필터링(backfill) 지원
+--
+--   price_logs_rejected            재필터에서 탈락한 행 보관 (price_logs에서 이동, 복구 가능)
+--   fn_price_logs_page             raw_data 키셋 페이지 조회 (id > p_after_id)
+--   fn_reject_price_logs           탈락 id를 한 트랜잭션에서 price_logs → price_logs_rejected로 이동
+--   fn_refresh_price_derivations   이동 후 해당 상품들의 파생 데이터만 재계산
+--                                  (previous_price / shop_last_prices / product_price_state → 대시보드 요약은 트리거로)
+--                                  호출 측에서 상품 몇십 개씩 나눠 부른다 (전체 재구성 없음)
+--
+-- 예전 수집기는 i번째 필터 통과 행에 i번째 원본 응답을 raw_data로 저장했기 때문에,
+-- 페이지 조회는 행의 가격/쇼핑몰/링크도 함께 돌려주고 raw_data와 짝이 맞는 행만 재평가한다.
+--
+--   python -m backend.collector.backfill [--apply]
+
+
+CREATE TABLE IF NOT EXISTS price_logs_rejected (
+    LIKE price_logs,
+    rejected_at  timestamptz NOT NULL DEFAULT now(),
+    reason       text
+);
+
+CREATE INDEX IF NOT EXISTS idx_price_logs_rejected_product ON price_logs_rejected (product_id);
+
+
+-- keyword는 현재 상품 키워드 (필터 규칙을 바꾼 뒤 다시 평가하는 용도)
+DROP FUNCTION IF EXISTS fn_price_logs_page(bigint, integer, bigint);
+
+CREATE FUNCTION fn_price_logs_page(
+    p_after_id    bigint,
+    p_limit       integer DEFAULT 1000,
+    p_product_id  bigint  DEFAULT NULL
+) RETURNS TABLE (
+    id           bigint,
+    product_id   bigint,
+    keyword      text,
+    price        integer,
+    shop_name    text,
+    product_url  text,
+    raw_data     jsonb
+)
+LANGUAGE sql STABLE AS $$
+    SELECT l.id, l.product_id, p.keyword, l.price, l.shop_name, l.product_url, l.raw_data::jsonb
+    FROM price_logs l
+    JOIN products p ON p.id = l.product_id
+    WHERE l.id > p_after_id
+      AND (p_product_id IS NULL OR l.product_id = p_product_id)
+    ORDER BY l.id
+    LIMIT p_limit;
+$$;
+
+
+CREATE OR REPLACE FUNCTION fn_reject_price_logs(p_ids bigint[], p_reason text DEFAULT NULL)
+RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    moved integer;
+BEGIN
+    WITH gone AS (
+        DELETE FROM price_logs WHERE id = ANY(p_ids) RETURNING *
+    )
+    INSERT INTO price_logs_rejected
+    SELECT gone.*, now(), p_reason FROM gone;
+    GET DIAGNOSTICS moved = ROW_COUNT;
+    RETURN moved;
+END $$;
+
+
+CREATE OR REPLACE FUNCTION fn_refresh_price_derivations(p_product_ids bigint[])
+RETURNS void
+LANGUAGE plpgsql AS $$
+BEGIN
+    -- previous_price: 같은 쇼핑몰의 직전 수집 회차(collected_at) 최저가
+    WITH runs AS (
+        SELECT product_id, shop_name, collected_at, min(price) AS price
+        FROM price_logs
+        WHERE product_id = ANY(p_product_ids)
+        GROUP BY product_id, shop_name, collected_at
+    ), prev AS (
+        SELECT product_id, shop_name, collected_at,
+               lag(price) OVER (PARTITION BY product_id, shop_name ORDER BY collected_at) AS previous_price
+        FROM runs
+    )
+    UPDATE price_logs l
+    SET previous_price = prev.previous_price
+    FROM prev
+    WHERE l.product_id = prev.product_id
+      AND l.shop_name = prev.shop_name
+      AND l.collected_at = prev.collected_at
+      AND l.previous_price IS DISTINCT FROM prev.previous_price;
+
+    DELETE FROM shop_last_prices WHERE product_id = ANY(p_product_ids);
+    INSERT INTO shop_last_prices (product_id, shop_name, price, previous_price, collected_at)
+    SELECT * FROM fn_shop_last_prices_source(p_product_ids);
+
+    -- 행 트리거(trg_price_state_summary)가 상품별 요약 기여분을 빼고 다시 더한다.
+    -- 일별 수집 건수는 이동(DELETE) 시점에 price_logs 트리거가 이미 차감했다.
+    DELETE FROM product_price_state WHERE product_id = ANY(p_product_ids);
+    INSERT INTO product_price_state (product_id, first_date, first_price, latest_date, min_price)
+    SELECT * FROM fn_product_price_state_source(p_product_ids);
+END $$;
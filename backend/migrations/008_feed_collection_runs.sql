@@ -0,0 +1,28 @@
+-- 실시간 피드: 커서 이후 새로 적재된 수집 회차 요약
+--
+-- 행 단위 이벤트 대신 수집 회차(같은 collected_at)당 한 건을 돌려준다.
+-- id > p_after_id PK 범위에서 최대 p_limit행만 읽는다. 돌려준 price_count 합이 p_limit이면
+-- 잘린 것이므로 호출 측이 last_id부터 다시 부르거나(폴러) reset을 보낸다(오래된 커서로 재접속).
+
+DROP FUNCTION IF EXISTS fn_collection_runs_after(bigint);
+
+CREATE FUNCTION fn_collection_runs_after(p_after_id bigint, p_limit integer DEFAULT 20000)
+RETURNS TABLE (
+    last_id        bigint,
+    collected_at   timestamptz,
+    price_count    integer,
+    product_count  integer
+)
+LANGUAGE sql STABLE AS $$
+    WITH page AS (
+        SELECT l.id, l.collected_at, l.product_id
+        FROM price_logs l
+        WHERE l.id > p_after_id
+        ORDER BY l.id
+        LIMIT p_limit
+    )
+    SELECT max(id), collected_at, count(*)::integer, count(DISTINCT product_id)::integer
+    FROM page
+    GROUP BY collected_at
+    ORDER BY max(id);
+$$;
@@ -1,10 +1,17 @@
-from datetime import datetime, timezone
+from __future__ import annotations
 
-from supabase import Client
-from postgrest.exceptions import APIError
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from supabase import Client
+    from backend.collector.buffer import PriceRowBuffer
 
 
 BATCH_SIZE = 500
+INGEST_BATCH_SIZE = 5000
+MAX_HISTORY_POINTS = 1000
+REFRESH_BATCH_SIZE = 50
+FEED_RUN_SCAN_LIMIT = 20000
 
 
 # ---------------------------------------------------------------------------
@@ -12,11 +19,11 @@ BATCH_SIZE = 500
 # ---------------------------------------------------------------------------
 
 def get_all_products(client: Client, search: str | None = None, status: str | None = None) -> list[dict]:
-    params = {}
     if search:
-        params["p_search"] = search
-
-    result = client.rpc("fn_products_with_prices", params).execute()
+        # 검색 인덱스(접두어/부분/자모 3-gram 유사도)로 찾은 상품만 순위순으로 조회
+        result = client.rpc("fn_search_products_with_prices", {"p_query": search}).execute()
+    else:
+        result = client.rpc("fn_products_with_prices", {}).execute()
 
     results = []
     for row in result.data:
@@ -99,16 +106,74 @@ def delete_product(client: Client, product_id: int) -> bool:
     return True
 
 
+def upsert_products_bulk(client: Client, rows: list[dict]) -> list[dict]:
+    """키워드 기준 일괄 upsert. rows는 검증/중복 제거된 {"row", "keyword", "target_price", "memo"}.
+    BATCH_SIZE 단위 RPC로 보내고 행마다 {"row", "keyword", "id", "status"}를 반환한다.
+    기존 상품은 값이 있는 필드만 갱신된다. 배치가 DB 오류로 실패하면 그 배치 행만 error로 표시한다
+    (앞선 배치는 이미 커밋된 상태).
+    """
+    from postgrest.exceptions import APIError
+
+    results = []
+    for i in range(0, len(rows), BATCH_SIZE):
+        batch = rows[i : i + BATCH_SIZE]
+        try:
+            result = client.rpc("fn_upsert_products", {
+                "p_keyword": [r["keyword"] for r in batch],
+                "p_target_price": [r.get("target_price") for r in batch],
+                "p_memo": [r.get("memo") for r in batch],
+            }).execute()
+        except APIError as e:
+            results.extend(
+                {"row": r["row"], "keyword": r["keyword"], "status": "error", "detail": f"DB 오류: {e.message}"}
+                for r in batch
+            )
+            continue
+        for out in result.data:
+            src = batch[out["ord"] - 1]
+            results.append({
+                "row": src["row"],
+                "keyword": src["keyword"],
+                "id": out["id"],
+                "status": "created" if out["created"] else "updated",
+            })
+    return results
+
+
 # ---------------------------------------------------------------------------
 # Prices
 # ---------------------------------------------------------------------------
 
-def get_price_history(client: Client, product_id: int, days: int = 30) -> list[dict]:
+def get_price_history(client: Client, product_id: int, days: int = 30, points: int | None = None) -> list[dict]:
     result = client.rpc("fn_price_history", {
         "p_product_id": product_id,
         "p_days": days,
     }).execute()
-    return result.data
+    return downsample_price_history(result.data, points or MAX_HISTORY_POINTS)
+
+
+def downsample_price_history(rows: list[dict], points: int) -> list[dict]:
+    """일별 이력을 최대 points개 구간으로 묶는다 (min/max 버킷 집계).
+    구간마다 최저가 행의 날짜/쇼핑몰/링크를 대표로 쓰고 max_price는 구간 최고가,
+    collected_count는 구간 합계라서 극값이 사라지지 않는다.
+    """
+    n = len(rows)
+    if n <= points:
+        return rows
+
+    buckets = []
+    for b in range(points):
+        chunk = rows[b * n // points : (b + 1) * n // points]
+        low = min(chunk, key=lambda r: r["min_price"])
+        buckets.append({
+            "date": low["date"],
+            "min_price": low["min_price"],
+            "max_price": max(r["max_price"] for r in chunk),
+            "shop": low.get("shop"),
+            "url": low.get("url"),
+            "collected_count": sum(r["collected_count"] for r in chunk),
+        })
+    return buckets
 
 
 def get_latest_prices(client: Client, product_id: int) -> dict | None:
@@ -170,6 +235,41 @@ def get_price_stats(client: Client, product_id: int, days: int = 30) -> dict | N
     }
 
 
+def get_prices_batch(client: Client, product_ids: list[int], days: int = 30) -> list[dict]:
+    """여러 상품의 최신 최저가 + 기간 통계 (RPC 1회). 요청 순서대로, 없는 id는 제외.
+    stats는 get_price_stats와 같은 값 (DB에서 상품마다 fn_price_stats 호출).
+    """
+    result = client.rpc("fn_prices_batch", {
+        "p_product_ids": product_ids,
+        "p_days": days,
+    }).execute()
+
+    items = []
+    for row in result.data:
+        items.append({
+            "product_id": row["product_id"],
+            "keyword": row["keyword"],
+            "min_price": row["latest_price"],
+            "shop": row["latest_shop"],
+            "url": row["latest_url"],
+            "collected_at": row["latest_collected_at"],
+            "stats": {
+                "product_id": row["product_id"],
+                "period_days": days,
+                "min_price": row["min_price"],
+                "max_price": row["max_price"],
+                "avg_price": row["avg_price"],
+                "current_price": row["current_price"],
+                "price_at_start": row["price_at_start"],
+                "change_from_start": row["change_from_start"],
+                "change_rate_from_start": float(row["change_rate_from_start"]),
+                "lowest_shop": row["lowest_shop"],
+                "data_count": row["data_count"],
+            },
+        })
+    return items
+
+
 # ---------------------------------------------------------------------------
 # Dashboard
 # ---------------------------------------------------------------------------
@@ -185,6 +285,12 @@ def get_dashboard_summary(client: Client) -> dict:
     }
 
 
+def reconcile_dashboard_summary(client: Client, fix: bool = False) -> list[dict]:
+    """증분 요약 vs 전체 재계산 비교. fix=True면 불일치 시 파생 테이블을 재구성한다."""
+    result = client.rpc("fn_dashboard_summary_reconcile", {"p_fix": fix}).execute()
+    return result.data
+
+
 # ---------------------------------------------------------------------------
 # Recent Collections
 # ---------------------------------------------------------------------------
@@ -203,40 +309,125 @@ def get_active_products(client: Client) -> list[dict]:
     return result.data
 
 
-def insert_price_logs_batch(client: Client, rows: list[dict]) -> int:
-    """배치 INSERT: BATCH_SIZE 단위로 나누어 삽입."""
-    total = 0
-    for i in range(0, len(rows), BATCH_SIZE):
-        batch = rows[i : i + BATCH_SIZE]
-        client.table("price_logs").insert(batch).execute()
-        total += len(batch)
-    return total
+class IngestError(Exception):
+    """fn_ingest_collection 호출 중 실패. 앞선 호출에서 이미 커밋된 건수를 함께 전달한다."""
+
+    def __init__(self, cause: Exception, saved_prices: int, saved_alerts: int, total_prices: int):
+        super().__init__(str(cause))
+        self.saved_prices = saved_prices
+        self.saved_alerts = saved_alerts
+        self.total_prices = total_prices
+
+
+def ingest_collection(client: Client, buffer: PriceRowBuffer, alerts: list[dict]) -> tuple[int, int]:
+    """수집 결과를 fn_ingest_collection으로 적재. (가격 건수, 알림 건수) 반환.
+    INGEST_BATCH_SIZE 이하면 RPC 1회(단일 트랜잭션), 넘으면 나누어 보낸다.
+    알림은 Slack이 이미 발송된 상태라 첫 호출에 실어 가장 먼저 기록한다.
+    나눠 보낼 때는 첫 호출의 collected_at을 이후 호출에 넘겨 한 수집 회차로 기록한다.
+    중간 호출이 실패하면 그때까지 커밋된 건수를 담아 IngestError를 던진다.
+    """
+    saved_prices = 0
+    saved_alerts = 0
+    collected_at = None
+    starts = list(range(0, len(buffer), INGEST_BATCH_SIZE)) or [0]
+    for n, i in enumerate(starts):
+        cols = buffer.columns(i, i + INGEST_BATCH_SIZE)
+        batch_alerts = alerts if n == 0 else []
+        try:
+            result = client.rpc("fn_ingest_collection", {
+                "p_product_id": cols["product_id"],
+                "p_shop_name": cols["shop_name"],
+                "p_price": cols["price"],
+                "p_product_url": cols["product_url"],
+                "p_raw_data": cols["raw_data"],
+                "p_alert_product_id": [a["product_id"] for a in batch_alerts],
+                "p_alert_triggered_price": [a["triggered_price"] for a in batch_alerts],
+                "p_alert_target_price": [a["target_price"] for a in batch_alerts],
+                "p_alert_shop_name": [a["shop_name"] for a in batch_alerts],
+                "p_collected_at": collected_at,
+            }).execute()
+        except Exception as e:
+            raise IngestError(e, saved_prices, saved_alerts, len(buffer)) from e
+        row = result.data[0]
+        collected_at = row["collected_at"]
+        saved_prices += row["price_count"]
+        saved_alerts += row["alert_count"]
+    return saved_prices, saved_alerts
+
+
+def get_recently_alerted_product_ids(client: Client, hours: int = 24) -> set[int]:
+    """최근 hours시간 안에 알림이 기록된 상품 id (수집 시작 시 1회 조회)."""
+    result = client.rpc("fn_recently_alerted_products", {"p_hours": hours}).execute()
+    return {row["product_id"] for row in result.data}
 
 
-def insert_alerts_batch(client: Client, rows: list[dict]) -> int:
-    """알림 배치 INSERT."""
-    if not rows:
-        return 0
-    total = 0
-    for i in range(0, len(rows), BATCH_SIZE):
-        batch = rows[i : i + BATCH_SIZE]
-        client.table("alerts").insert(batch).execute()
-        total += len(batch)
-    return total
+# ---------------------------------------------------------------------------
+# Backfill (재필터링)
+# ---------------------------------------------------------------------------
+
+def get_price_logs_page(client: Client, after_id: int, limit: int = 1000, product_id: int | None = None) -> list[dict]:
+    """raw_data 키셋 페이지 (id > after_id, id 오름차순). keyword는 현재 상품 키워드,
+    price/shop_name/product_url은 행에 저장된 값 (raw_data 짝 검증용)."""
+    result = client.rpc("fn_price_logs_page", {
+        "p_after_id": after_id,
+        "p_limit": limit,
+        "p_product_id": product_id,
+    }).execute()
+    return result.data
+
+
+def reject_price_logs(client: Client, ids: list[int], reason: str) -> int:
+    """price_logs → price_logs_rejected 이동. 이동한 건수 반환."""
+    moved = 0
+    for i in range(0, len(ids), BATCH_SIZE):
+        result = client.rpc("fn_reject_price_logs", {
+            "p_ids": ids[i : i + BATCH_SIZE],
+            "p_reason": reason,
+        }).execute()
+        moved += result.data
+    return moved
 
 
-def check_recent_alert(client: Client, product_id: int, hours: int = 24) -> bool:
-    cutoff = datetime.now(timezone.utc).isoformat()
-    # hours 전 시각 계산
-    from datetime import timedelta
-    cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+def refresh_price_derivations(client: Client, product_ids: list[int]):
+    """해당 상품들의 직전가/쇼핑몰별 최신가/가격 상태(→ 대시보드 요약) 재계산.
+    상품마다 전체 이력을 다시 읽으므로 호출 측에서 REFRESH_BATCH_SIZE개씩 나눠 부른다.
+    """
+    client.rpc("fn_refresh_price_derivations", {"p_product_ids": product_ids}).execute()
 
+
+# ---------------------------------------------------------------------------
+# Live feed (SSE)
+# ---------------------------------------------------------------------------
+
+def get_feed_head(client: Client) -> tuple[int, int]:
+    """(price_logs 최대 id, alerts 최대 id). 빈 테이블이면 0."""
+    heads = []
+    for table in ("price_logs", "alerts"):
+        result = client.table(table).select("id").order("id", desc=True).limit(1).execute()
+        heads.append(result.data[0]["id"] if result.data else 0)
+    return heads[0], heads[1]
+
+
+def get_collection_runs_after(client: Client, after_id: int, limit: int = FEED_RUN_SCAN_LIMIT) -> list[dict]:
+    """after_id 이후 적재된 price_logs(최대 limit행)를 수집 회차(collected_at)별로 묶어 last_id 오름차순 반환.
+    price_count 합이 limit이면 잘린 것."""
+    result = client.rpc("fn_collection_runs_after", {"p_after_id": after_id, "p_limit": limit}).execute()
+    return result.data
+
+
+def get_alerts_after(client: Client, after_id: int, limit: int = BATCH_SIZE) -> list[dict]:
+    """after_id 이후 새로 기록된 alerts(목표가 도달)를 id 오름차순으로 반환."""
     result = (
         client.table("alerts")
-        .select("id")
-        .eq("product_id", product_id)
-        .gte("notified_at", cutoff)
-        .limit(1)
+        .select("id, product_id, triggered_price, target_price, shop_name, notified_at, products(keyword)")
+        .gt("id", after_id)
+        .order("id")
+        .limit(limit)
         .execute()
     )
-    return len(result.data) > 0
+    rows = []
+    for row in result.data:
+        product = row.pop("products", None) or {}
+        row["product_name"] = product.get("keyword", "")
+        rows.append(row)
+    return rows
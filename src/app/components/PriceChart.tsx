@@ -17,6 +17,9 @@ const daysMap: Record<PeriodFilter, number> = {
   'all': 0,
 };
 
+// 기간이 길어도 차트 포인트 수는 서버에서 이 값 이하로 축약된다
+const MAX_CHART_POINTS = 180;
+
 interface PriceChartProps {
   products: ProductResponse[];
 }
@@ -31,7 +34,7 @@ export function PriceChart({ products }: PriceChartProps) {
     }
   }, [products, selectedProduct]);
 
-  const { data: priceData, isLoading } = usePriceHistory(selectedProduct, daysMap[period]);
+  const { data: priceData, isLoading } = usePriceHistory(selectedProduct, daysMap[period], MAX_CHART_POINTS);
 
   const chartData = (priceData ?? []).map(item => ({
     date: new Date(item.date).toLocaleDateString('ko-KR', { month: 'short', day: 'numeric' }),
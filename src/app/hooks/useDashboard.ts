@@ -1,10 +1,76 @@
-import { useQuery } from '@tanstack/react-query';
+import { useEffect, useState } from 'react';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import * as dashboardService from '../services/dashboardService';
+import type { RecentCollection } from '../services/priceService';
+import type { ProductResponse } from '../services/productService';
+import { API_BASE_URL, LIVE_FEED } from '../services/api';
 
-export function useDashboardSummary() {
+interface CollectionEvent {
+  last_id: number;
+  collected_at: string;
+  price_count: number;
+  product_count: number;
+  recent: RecentCollection[] | null;
+  products: ProductResponse[] | null;
+}
+
+export function useDashboardSummary(live: boolean = false) {
   return useQuery({
     queryKey: ['dashboardSummary'],
     queryFn: dashboardService.getDashboardSummary,
-    refetchInterval: 60000,
+    // 피드 연결 중에는 summary 이벤트로 갱신되므로 폴링하지 않는다
+    refetchInterval: live ? false : 60000,
   });
 }
+
+/** /stream/collections SSE 구독. 연결 여부를 반환한다 (끊기거나 꺼져 있으면 폴링으로 대체). */
+export function useCollectionFeed() {
+  const queryClient = useQueryClient();
+  const [connected, setConnected] = useState(false);
+
+  useEffect(() => {
+    if (!LIVE_FEED || typeof EventSource === 'undefined') return;
+    // EventSource가 재접속 시 Last-Event-ID를 자동으로 보내 누락분을 이어 받는다
+    const source = new EventSource(`${API_BASE_URL}/stream/collections`);
+
+    source.onopen = () => setConnected(true);
+    // 404 등으로 닫히면(CLOSED) 재접속하지 않고 폴링 모드로 남는다
+    source.onerror = () => setConnected(false);
+
+    source.addEventListener('summary', (e) => {
+      const { changed: _changed, ...summary } = JSON.parse((e as MessageEvent).data);
+      queryClient.setQueryData(['dashboardSummary'], summary);
+    });
+    // 수집 회차가 적재될 때마다 한 번. 마지막 회차에 최근 수집 내역/상품 목록이 실려 온다.
+    source.addEventListener('collection', (e) => {
+      const { recent, products }: CollectionEvent = JSON.parse((e as MessageEvent).data);
+      if (recent) {
+        for (const [key] of queryClient.getQueriesData({ queryKey: ['recentCollections'] })) {
+          const limit = key[1] as number;
+          if (limit <= recent.length) {
+            queryClient.setQueryData(key, recent.slice(0, limit));
+          } else {
+            queryClient.invalidateQueries({ queryKey: key, exact: true });
+          }
+        }
+      }
+      if (products) {
+        // 전체 목록만 교체하고, 검색/상태 필터 목록은 화면에 떠 있을 때만 다시 불러온다
+        queryClient.setQueryData(['products', undefined, undefined], products);
+        queryClient.invalidateQueries({
+          queryKey: ['products'],
+          predicate: (q) => q.queryKey[1] !== undefined || q.queryKey[2] !== undefined,
+        });
+      }
+      queryClient.invalidateQueries({ queryKey: ['latestPrices'] });
+    });
+    // goal_reached는 따로 처리하지 않는다: 상품 상태(알림 목록)는 같은 회차의 collection 이벤트로 교체된다
+    source.addEventListener('reset', () => {
+      queryClient.invalidateQueries();
+    });
+
+    return () => source.close();
+  }, [queryClient]);
+
+  return connected;
+}
@@ -1,10 +1,10 @@
 import { useQuery } from '@tanstack/react-query';
 import * as priceService from '../services/priceService';
 
-export function usePriceHistory(productId: number, days: number = 30) {
+export function usePriceHistory(productId: number, days: number = 30, points?: number) {
   return useQuery({
-    queryKey: ['priceHistory', productId, days],
-    queryFn: () => priceService.getPriceHistory(productId, days),
+    queryKey: ['priceHistory', productId, days, points],
+    queryFn: () => priceService.getPriceHistory(productId, days, points),
     enabled: productId > 0,
   });
 }
@@ -3,12 +3,13 @@ import { StatsCard } from '../components/StatsCard';
 import { PriceChart } from '../components/PriceChart';
 import { AlertsList } from '../components/AlertsList';
 import { RecentCollectionsTable } from '../components/RecentCollectionsTable';
-import { useDashboardSummary } from '../hooks/useDashboard';
+import { useCollectionFeed, useDashboardSummary } from '../hooks/useDashboard';
 import { useProducts } from '../hooks/useProducts';
 import { Skeleton } from '../components/ui/skeleton';
 
 export function Dashboard() {
-  const { data: summary, isLoading: summaryLoading } = useDashboardSummary();
+  const live = useCollectionFeed();
+  const { data: summary, isLoading: summaryLoading } = useDashboardSummary(live);
   const { data: products, isLoading: productsLoading } = useProducts();
 
   const goalReachedProducts = (products ?? []).filter(p => p.status === 'goal_reached');
@@ -1,4 +1,9 @@
-const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || (import.meta.env.PROD ? '/api' : 'http://localhost:8000');
+export const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || (import.meta.env.PROD ? '/api' : 'http://localhost:8000');
+
+// 실시간 피드(/stream)는 상주 API 서버에서만 켜진다. Vercel 배포는 기본 off → 폴링
+export const LIVE_FEED = import.meta.env.VITE_LIVE_FEED
+  ? import.meta.env.VITE_LIVE_FEED === 'true'
+  : !import.meta.env.PROD;
 
 export class ApiError extends Error {
   constructor(
@@ -48,8 +48,9 @@ export interface RecentCollection {
   collected_at: string;
 }
 
-export async function getPriceHistory(productId: number, days: number = 30): Promise<PriceHistoryItem[]> {
-  return api.request<PriceHistoryItem[]>(`/prices/${productId}?days=${days}`);
+export async function getPriceHistory(productId: number, days: number = 30, points?: number): Promise<PriceHistoryItem[]> {
+  const query = points ? `days=${days}&points=${points}` : `days=${days}`;
+  return api.request<PriceHistoryItem[]>(`/prices/${productId}?${query}`);
 }
 
 export async function getLatestPrices(productId: number): Promise<LatestPriceResponse> {